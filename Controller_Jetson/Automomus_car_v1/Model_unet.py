@@ -1,20 +1,27 @@
-import numpy as np
-import tensorrt as trt
-import pycuda.driver as cuda
-import pycuda.autoinit # This initializes CUDA context
 import config
 # Must import cv2 because it is used for resizing and color conversion
 import cv2 
+from preprocess import FusedPreprocessor, IMAGENET_MEAN, IMAGENET_STD
+from inference_backends import make_backend
+from inference_pipeline import InferencePipeline
+from postprocess import threshold_logits
 
-# Define the logger here since it's used inside the class definition
-TRT_LOGGER = trt.Logger(trt.Logger.WARNING)
 
 class TensorRTUnetSegmentor:
     """
-    Handles TensorRT engine loading and inference for the U-Net segmentation model.
+    Handles engine loading and inference for the U-Net segmentation model.
     The class is initialized with all necessary dimensions from the main script.
+
+    The engine itself is an inference backend (inference_backends.py):
+    TensorRT on the Jetson, onnxruntime or a NumPy stub anywhere else,
+    chosen by config.INFERENCE_BACKEND unless one is passed in.
+
+    pipeline_depth > 1 gives the backend that many buffer slots (TensorRT:
+    bindings + CUDA stream each) and runs frames through submit(): frame
+    N+1 is preprocessed while frame N is still on the GPU.
     """
-    def __init__(self, engine_path, model_input_h, model_input_w, output_width, output_height):
+    def __init__(self, engine_path, model_input_h, model_input_w, output_width, output_height,
+                 backend=None, pipeline_depth=1):
         
         # Store dimensions as instance variables
         self.MODEL_INPUT_H = model_input_h
@@ -22,130 +29,74 @@ class TensorRTUnetSegmentor:
         self.OUTPUT_WIDTH = output_width
         self.OUTPUT_HEIGHT = output_height
 
-        # 1. Load Engine
-        print(f"Loading TensorRT engine from {engine_path}...")
-        runtime = trt.Runtime(TRT_LOGGER)
-        with open(engine_path, "rb") as f:
-            self.engine = runtime.deserialize_cuda_engine(f.read())
-        
-        if not self.engine:
-            raise RuntimeError(f"Failed to load TensorRT engine from {engine_path}")
-            
-        self.context = self.engine.create_execution_context()
-        print("Engine loaded successfully.")
-        
-        # 2. Allocate I/O buffers (Host and Device)
-        self.bindings = []
-        self.output_binding = None
-        self.output_shape = None
-        
-        for binding in self.engine:
-            size = trt.volume(self.engine.get_binding_shape(binding)) * self.engine.max_batch_size
-            dtype = trt.nptype(self.engine.get_binding_dtype(binding))
-            
-            # Host memory (Page-locked for faster transfer)
-            host_mem = cuda.pagelocked_empty(size, dtype)
-            # Device memory
-            device_mem = cuda.mem_alloc(host_mem.nbytes)
-            
-            self.bindings.append(int(device_mem))
-
-            if self.engine.binding_is_input(binding):
-                self.input_shape = self.engine.get_binding_shape(binding)
-                self.input_h_mem = host_mem
-                self.input_d_mem = device_mem
-            else:
-                self.output_shape = self.engine.get_binding_shape(binding)
-                self.output_h_mem = host_mem
-                self.output_d_mem = device_mem
-                self.output_name = binding
-                self.output_dtype = dtype
-                
-        self.input_channels = self.input_shape[1] 
-
-    def _preprocess(self, frame):
-        """
-        Converts BGR frame to required TensorRT input format
-        (Normalized, FP32, HWC -> CHW)
-        """
-
-        # 1. Resize
-        input_frame = cv2.resize(
-            frame,
-            (self.MODEL_INPUT_W, self.MODEL_INPUT_H)
-        )
-
-        # 2. BGR -> RGB (only if model expects RGB)
-        input_frame = cv2.cvtColor(input_frame, cv2.COLOR_BGR2RGB)
-
-        # 3. Normalize to [0, 1]
-        input_data = input_frame.astype(np.float32) / 255.0
-
-        # 4. HWC -> CHW
-        input_data = input_data.transpose((2, 0, 1))
-
-        # 5. Copy to pagelocked host memory
-        np.copyto(self.input_h_mem, input_data.ravel())
-
-        # 6. Transfer to device
-        cuda.memcpy_htod(self.input_d_mem, self.input_h_mem)
-
-
-    def _preprocess2(self, frame):
-        # 1. Resize and Convert BGR to RGB
-        input_frame = cv2.resize(frame, (self.MODEL_INPUT_W, self.MODEL_INPUT_H))
-        input_frame = cv2.cvtColor(input_frame, cv2.COLOR_BGR2RGB)
-
-        # 2. MATCH PYTORCH NORMALIZATION (The Missing Step)
-        input_data = input_frame.astype(np.float32) / 255.0
-        mean = np.array([0.485, 0.456, 0.406], dtype=np.float32)
-        std = np.array([0.229, 0.224, 0.225], dtype=np.float32)
-        input_data = (input_data - mean) / std # This is what albumentations does
-        
-        # 3. HWC to CHW
-        input_data = input_data.transpose((2, 0, 1))
-        
-        # 4. Flatten and copy to host memory
-        np.copyto(self.input_h_mem, input_data.ravel())
-        
-        # 5. Transfer data to device
-        cuda.memcpy_htod(self.input_d_mem, self.input_h_mem)
+        # 1. Load Engine + allocate I/O buffers
+        if backend is None:
+            backend = make_backend(
+                config.INFERENCE_BACKEND,
+                engine_path=engine_path,
+                onnx_path=config.ONNX_MODEL_PATH,
+                input_h=model_input_h,
+                input_w=model_input_w,
+                slots=pipeline_depth
+            )
+        self.backend = backend
+        self.input_h_mem = backend.input_host
+        self.output_shape = backend.output_shape
+
+        # 2. Preprocessing writes straight into each slot's input_h_mem
+        #    (True = marbel model [0, 1], False = road model ImageNet mean/std)
+        if config.MODEL_PREPROCESS:
+            mean, std = None, None
+        else:
+            mean, std = IMAGENET_MEAN, IMAGENET_STD
+        preprocessors = [
+            FusedPreprocessor(model_input_h, model_input_w, host_mem, mean, std)
+            for host_mem in backend.input_hosts[:pipeline_depth]
+        ]
 
+        # 3. Slot rotation (depth 1 = synchronous)
+        self.pipeline = InferencePipeline(backend, pipeline_depth, preprocessors)
 
+    def _postprocess(self, output_data):
+        """
+        Processes raw model output (e.g. (1, 1, H, W) logits) into a visual segmentation mask.
 
-    def _postprocess(self):
-        """Processes raw TensorRT output into a visual segmentation mask."""
-        # 1. Transfer data from device to host
-        cuda.memcpy_dtoh(self.output_h_mem, self.output_d_mem)
+        config.MASK_AT_MODEL_RES: the mask stays at model resolution and
+        consumers map it to camera pixels with postprocess.mask_scale()
+        (PathPlanning does); otherwise it is resized to camera resolution.
+        """
+        # 3. Threshold (binary segmentation C=1): sigmoid > 0.5 == logit > 0
+        mask_np = threshold_logits(output_data)
 
-        # 2. Reshape output (e.g., (1, 1, H, W))
-        output_data = self.output_h_mem.reshape(self.output_shape)
-        
-        # 3. Apply Sigmoid/Threshold (Assuming binary segmentation C=1)
-        # Apply sigmoid to convert logits to probabilities
-        segmentation_probs = 1.0 / (1.0 + np.exp(-output_data))
-        
-        # Squeeze batch and channel dimension (e.g., -> HxW)
-        segmentation_map = segmentation_probs[0, 0, :, :]
-        
-        # Create binary mask 
-        mask_np = (segmentation_map > 0.5).astype(np.uint8) * 255
-        
         # 4. Resize mask back to original camera resolution
-        mask_np = cv2.resize(mask_np, (self.OUTPUT_WIDTH, self.OUTPUT_HEIGHT), interpolation=cv2.INTER_NEAREST)
-        
+        if not config.MASK_AT_MODEL_RES:
+            mask_np = cv2.resize(mask_np, (self.OUTPUT_WIDTH, self.OUTPUT_HEIGHT), interpolation=cv2.INTER_NEAREST)
+
         return mask_np
 
     def infer(self, frame):
         """Runs the complete inference cycle and returns the segmentation mask."""
-        if config.MODEL_PREPROCESS:
-            self._preprocess(frame)
-        else:
-            self._preprocess2(frame)
-        
-       
-        # Execute inference
-        self.context.execute_v2(bindings=self.bindings)
-        
+        if len(self.pipeline):
+            raise RuntimeError("infer() with pipelined frames in flight, use submit()/flush()")
+
+        # Preprocess + execute inference
+        result = self.pipeline.push(frame)
+        if result is None:
+            result = self.pipeline.flush()[0]
+
         # Postprocess and return the mask
-        return self._postprocess()
+        return self._postprocess(result[1])
+
+    def submit(self, frame, tag=None):
+        """
+        Pipelined infer(): queues frame and returns (tag, mask) of the frame
+        submitted pipeline_depth - 1 calls earlier, or None while filling.
+        """
+        result = self.pipeline.push(frame, tag)
+        if result is None:
+            return None
+        return result[0], self._postprocess(result[1])
+
+    def flush(self):
+        """(tag, mask) of every frame still in the pipeline, oldest first."""
+        return [(tag, self._postprocess(logits)) for tag, logits in self.pipeline.flush()]
@@ -7,7 +7,7 @@ class PID:
         self._limits = output_limits
         self._prev_error = 0
         self._integral = 0
-        self._last_time = time.time()
+        self._last_time = None   # set by the first compute(), in the caller's clock
 
     def set_tunings(self, kp, ki, kd):
         """Changes the PID constants on the fly."""
@@ -20,16 +20,26 @@ class PID:
         # print(f"UPDATED..{kp} {ki} {kd}")
 
 
-    def compute(self, measurement):
-        now = time.time()
-        dt = now - self._last_time
-        
+    def compute(self, measurement, now=None):
+        """
+        now: time.monotonic() of the measurement (e.g. camera capture time);
+        defaults to the call time. Wall-clock time.time() could jump.
+
+        Returns None when there is no dt to work with - the first call
+        after __init__/reset(), or timing that is inconsistent (dt <= 0 or
+        > 0.5 s) - the measurement only (re)starts the timing then, and the
+        caller keeps its previous output instead of getting a 0.
+        """
+        if now is None:
+            now = time.monotonic()
+        error = self.setpoint - measurement
+
         # Prevent division by zero or huge jumps if timing is inconsistent
-        if dt <= 0 or dt > 0.5: 
+        if self._last_time is None or not 0 < now - self._last_time <= 0.5:
             self._last_time = now
-            return 0
-        
-        error = self.setpoint - measurement
+            self._prev_error = error   # no derivative kick on the next call
+            return None
+        dt = now - self._last_time
         
         # Proportional term
         p_term = self.kp * error
@@ -61,4 +71,4 @@ class PID:
         """Call this when switching modes to clear old errors"""
         self._integral = 0
         self._prev_error = 0
-        self._last_time = time.time()
\ No newline at end of file
+        self._last_time = None
\ No newline at end of file
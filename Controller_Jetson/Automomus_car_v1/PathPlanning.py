@@ -2,6 +2,7 @@ import math
 import numpy as np
 import cv2
 import config
+from postprocess import mask_scale
 
 def calculate_steering_error(center_bottom, target_point):
     """
@@ -20,19 +21,65 @@ def calculate_steering_error(center_bottom, target_point):
     return math.degrees(angle_rad)
 
 
-def path_planning_thread(frame_queue, shared_angle, shared_seq, stop_event, state_lock, shared_state):
+def find_center_points(mask, step=None, roi=None):
+    """
+    Scans every `step`-th camera row of `roi` and returns the middle of
+    the path pixels (first..last 255) as (x, y) for each row that has
+    any, plus the number of rows scanned.
+
+    step / roi default to config.PATH_SCAN_STEP / PATH_SCAN_ROI; roi is
+    (x0, y0, x1, y1) in camera pixels, end exclusive, None = whole frame.
+
+    All sampled rows are taken as one 2D slice: first hit = argmax of the
+    bool rows, last hit = argmax of the column-reversed rows, rows without
+    a hit are dropped by any(). Same points as the per-row np.where loop
+    it replaced (reference_center_points() in bench_path_planning.py).
+
+    The mask may be at model resolution (config.MASK_AT_MODEL_RES): rows
+    and columns are mapped through postprocess.MaskScale, so the points
+    are camera pixels, identical to a scan of the upscaled mask.
+    """
+    if step is None:
+        step = config.PATH_SCAN_STEP
+    if roi is None:
+        roi = config.PATH_SCAN_ROI
+    scale = mask_scale(mask, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+    x_lo, y_lo, x_hi, y_hi = roi or (0, 0, scale.out_w, scale.out_h)
+
+    ys = np.arange(y_lo, y_hi, step)
+    if not len(ys):
+        return [], 0
+
+    # mask columns read by any camera column of the ROI
+    m_lo, m_hi = scale.src_x[x_lo], scale.src_x[x_hi - 1] + 1
+    if scale.identity:
+        rows = mask[y_lo:y_hi:step, m_lo:m_hi]
+    else:
+        rows = mask[scale.src_y[ys], m_lo:m_hi]
+    hit = rows == 255
+
+    found = hit.any(axis=1)
+    first = hit.argmax(axis=1)[found] + m_lo
+    last = (m_hi - 1) - hit[:, ::-1].argmax(axis=1)[found]
+
+    # back to camera columns; an edge mask column may reach outside the ROI
+    x0, x1 = scale.x_span(first, last)
+    x0 = np.maximum(x0, x_lo)
+    x1 = np.minimum(x1, x_hi - 1)
+
+    center_x = (x0 + x1) // 2
+    return list(zip(center_x.tolist(), ys[found].tolist())), len(ys)
+
+
+def path_planning_thread(frame_queue, perception, stop_event, state_lock, shared_state):
     smoothed_angle = 0.0
     while not stop_event.is_set():
         try:
-            frame, mask = frame_queue.get(timeout=0.1)
+            frame, mask, frame_ts = frame_queue.get(timeout=0.1)
         except:
             continue
 
-        center_points = []
-        for y in range(0, mask.shape[0], 50):
-            idx = np.where(mask[y] == 255)[0]
-            if len(idx):
-                center_points.append(((idx[0] + idx[-1]) // 2, y))
+        center_points, n_rows = find_center_points(mask)
 
         if len(center_points) <= config.LOOK_AHEAD:
             continue
@@ -51,8 +98,12 @@ def path_planning_thread(frame_queue, shared_angle, shared_seq, stop_event, stat
         # EMA Filter
         smoothed_angle = (config.EMA_ALPHA * angle) + ((1 - config.EMA_ALPHA) * smoothed_angle)
 
-        shared_angle.value = float(smoothed_angle)
-        shared_seq.value += 1
+        perception.write(
+            smoothed_angle,
+            frame_ts,
+            center_points,
+            len(center_points) / n_rows   # confidence: rows with path pixels
+        )
         with state_lock:
             shared_state["angle"] = smoothed_angle
             shared_state["center_points"] = center_points
@@ -68,6 +119,7 @@ def overlay(frame, mask, state_lock, shared_state):
         center= shared_state["center"]
 
     # ---- overlay mask ----
+    mask = mask_scale(mask, frame.shape[1], frame.shape[0]).upscale(mask)
     color_mask = np.zeros_like(frame, dtype=np.uint8)
     color_mask[mask > 0] = (255, 255, 255)
     output = cv2.addWeighted(frame, 1.0, color_mask, 0.5, 0)
@@ -4,9 +4,12 @@ import websockets
 import struct
 import time
 from typing import Dict, Any
-from tinytlvx import TinyTLVRx, TTP_FRAME_TYPE_RC, TTP_FRAME_TYPE_CONFIG
+from tinytlvx import (
+    TinyTLVRx, TinyTLVLayout, TTP_FRAME_TYPE_RC, TTP_FRAME_TYPE_CONFIG, TTP_FRAME_TYPE_RC_DELTA,
+    CaptureWriter
+)
 import TelemetryOutput
-import queue
+from latency_stats import now_ns
 
 # =========================
 # CHANNEL DEFINITIONS
@@ -26,37 +29,72 @@ CONFIG = {
     3: "Kd",
 }
 
+# Fixed layout sent by the CT6B transmitter: 7 x u16 channels + u32 timestamp.
+# Frames matching it are decoded with one unpack_from(); anything else
+# (e.g. the browser's variable-width TLVs) takes the generic TLV path.
+RC_LAYOUT = TinyTLVLayout(
+    TTP_FRAME_TYPE_RC,
+    [(ch_id, "H") for ch_id in range(7)] + [(100, "I")]
+)
+RC_LAYOUT_NAMES = tuple(RC_CHANNELS.get(ch_id, f"CH_{ch_id}") for ch_id in RC_LAYOUT.ids)
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_F32 = struct.Struct("<f")
+
 # =========================
 # RC DECODER
 # =========================
 
 class RCDataDecoder:
-    def __init__(self, ws_uri, loop):
+    def __init__(self, ws_uri, loop, capture_path=None):
         self.ws_uri = ws_uri
         self.loop = loop
         self.rx = TinyTLVRx()
         self.latest_data = {}
+        self.rc_keyframe = None  # last full RC frame, base for RC_DELTA frames
         self.loop = loop
 
+        # New-frame signalling for the event-driven control loop
+        self.seq = 0                 # bumped for every decoded frame
+        self.recv_ns = 0             # now_ns() when the latest frame's message arrived
+        self.decode_ns = 0           # now_ns() when the latest frame was decoded
+        self.new_data = asyncio.Event()
+
+        # Optional raw capture of every binary message (see tinytlv.capture)
+        self.capture = CaptureWriter(capture_path) if capture_path else None
+
+    def close(self):
+        if self.capture:
+            self.capture.close()
+            self.capture = None
+
     def get_latest_data(self) -> Dict[str, Any]:
         return self.latest_data
 
+    async def wait_for_data(self, last_seq: int, timeout: float) -> int:
+        """
+        Returns as soon as a frame newer than last_seq has been decoded, or
+        after timeout seconds (the caller's watchdog tick). Returns self.seq.
+        """
+        if self.seq == last_seq:
+            self.new_data.clear()
+            try:
+                await asyncio.wait_for(self.new_data.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.seq
+
     def decode_rc_data(self) -> Dict[str, Any]:
         frame_type = self.rx.getType()
         decoded = {}
 
         if frame_type == TTP_FRAME_TYPE_CONFIG:
-            self.rx.beginTLV()
-            while True:
-                tlv = self.rx.nextTLV()
-                if tlv is None:
-                    break
-
-                ch_id, length, data = tlv
-                if length == 4:
-                    value = struct.unpack("<f", data)[0]
-                elif length == 2:
-                    value = struct.unpack("<H", data)[0]
+            for ch_id, data in self.rx.iterTLV():
+                if len(data) == 4:
+                    value = _F32.unpack_from(data)[0]
+                elif len(data) == 2:
+                    value = _U16.unpack_from(data)[0]
                 else:
                     continue
 
@@ -66,48 +104,65 @@ class RCDataDecoder:
             return decoded
 
         elif frame_type == TTP_FRAME_TYPE_RC:
-            self.rx.beginTLV()
-            while True:
-                tlv = self.rx.nextTLV()
-                if tlv is None:
-                    break
-
-                ch_id, length, data = tlv
-
-                if ch_id == 100 and length == 4:
-                    # Timestamp is a Uint32
-                    decoded["timestamp"] = struct.unpack('<I', data)[0]
-                    
-                if length == 2:
-                    value = struct.unpack("<H", data)[0]
-                    decoded[RC_CHANNELS.get(ch_id, f"CH_{ch_id}")] = value
+            values = RC_LAYOUT.unpack(self.rx)
+            if values is not None:
+                decoded = dict(zip(RC_LAYOUT_NAMES, values))
+            else:
+                self._decode_rc_tlvs(decoded)
 
             decoded["_type"] = "RC"
+            self.rc_keyframe = decoded
+            return decoded
+
+        elif frame_type == TTP_FRAME_TYPE_RC_DELTA:
+            if self.rc_keyframe is None:
+                return {}  # no keyframe to apply the delta to yet
+
+            decoded = dict(self.rc_keyframe)
+            self._decode_rc_tlvs(decoded)
             return decoded
 
         return {}
 
+    def _decode_rc_tlvs(self, decoded: Dict[str, Any]):
+        """Generic RC TLV walk: u16 channels + u32 timestamp, into decoded."""
+        for ch_id, data in self.rx.iterTLV():
+            length = len(data)
+
+            if ch_id == 100 and length == 4:
+                # Timestamp is a Uint32
+                decoded["timestamp"] = _U32.unpack_from(data)[0]
+                
+            if length == 2:
+                value = _U16.unpack_from(data)[0]
+                decoded[RC_CHANNELS.get(ch_id, f"CH_{ch_id}")] = value
+
     # =========================
     # SENDER LOOP
     # =========================
     async def sender_loop(self, websocket):
         """
-        Reads telemetry messages from TelemetryOutput queue
-        and sends them over the websocket.
+        Sends the pending TelemetryOutput messages (newest per topic) as
+        soon as they are published. Binary TinyTLV frames published together
+        go out as one WebSocket message (the receiver walks every frame in
+        it); JSON strings are sent one by one.
         """
-        q = TelemetryOutput.get_queue()
+        bus = TelemetryOutput.bus
+        bus.attach_loop(asyncio.get_event_loop())
 
         while True:
             try:
-                # queue.Queue is NOT async → use non-blocking get
-                try:
-                    msg = q.get_nowait()
-                except queue.Empty:
-                    await asyncio.sleep(0.02)
-                    continue
+                messages = await bus.wait()
 
-                # Send telemetry (string or bytes)
-                await websocket.send(msg)
+                frames = [msg for msg in messages if isinstance(msg, bytes)]
+                if len(frames) == 1:
+                    await websocket.send(frames[0])
+                elif frames:
+                    await websocket.send(b"".join(frames))
+
+                for msg in messages:
+                    if not isinstance(msg, bytes):
+                        await websocket.send(msg)
 
             except Exception as e:
                 print("[SENDER ERROR]", e)
@@ -117,12 +172,35 @@ class RCDataDecoder:
     # =========================
     # MAIN RECEIVER LOOP
     # =========================
+    def handle_message(self, message):
+        """
+        Decodes one binary WebSocket message (any number of frames) into
+        latest_data. Also the sink for tinytlv.replay()/replay_async().
+        """
+        recv_ns = now_ns()
+        arrival_ts = int(time.time() * 1000) & 0xFFFFFFFF
+
+        if self.capture:
+            self.capture.write(message)
+
+        for _ in self.rx.feed_buffer(message):
+            decoded = self.decode_rc_data()
+            if decoded:
+                decoded["arrival_ts"] = arrival_ts
+                self.latest_data = decoded
+                self.recv_ns = recv_ns
+                self.decode_ns = now_ns()
+                self.seq += 1
+                self.new_data.set()
+                # print(decoded)
+
     async def run(self):
         while True:
             try:
                 async with websockets.connect(self.ws_uri) as websocket:
                     print("🔗 Connected to", self.ws_uri)
                     self.rx.reset()
+                    self.rc_keyframe = None
 
                     # START SENDER TASK (Python 3.6 safe)
                     sender_task = self.loop.create_task(
@@ -133,18 +211,10 @@ class RCDataDecoder:
                         while True:
                             message = await websocket.recv()
 
-                            arrival_ts = int(time.time() * 1000) & 0xFFFFFFFF
-
                             if isinstance(message, str):
                                 continue
 
-                            for b in message:
-                                if self.rx.feed(b):
-                                    decoded = self.decode_rc_data()
-                                    if decoded:
-                                        decoded["arrival_ts"] = arrival_ts
-                                        self.latest_data = decoded
-                                        # print(decoded)
+                            self.handle_message(message)
 
                     except websockets.exceptions.ConnectionClosed:
                         print("⚠️ WebSocket closed")
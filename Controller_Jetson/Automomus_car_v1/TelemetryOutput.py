@@ -1,33 +1,187 @@
 
-import queue
+import asyncio
 import time
 from threading import Lock
 
-# Singleton Queue
-_msg_queue = queue.Queue()
-_last_sent_times = {}
-_lock = Lock()
+from tinytlvx import TinyTLVLayout, TTP_FRAME_TYPE_TELEMETRY
 
-def send(message: str, min_interval: float = 0.0):
+# Binary telemetry frames (config.TELEMETRY_FORMAT = "tlv"): one float32 TLV
+# per field, decoded in the browser by decodeTelemetry() (TinyTVL.tsx).
+TELEMETRY_IDS = {
+    "V": 1,
+    "I": 2,
+    "P": 3,
+    "error": 4,
+    "correction": 5,
+    "throttle": 6,
+}
+
+def _layout(*names):
+    return TinyTLVLayout(TTP_FRAME_TYPE_TELEMETRY, [(TELEMETRY_IDS[n], "f") for n in names])
+
+# MOTOR_LAYOUT.pack((v, i, p)) -> bytes, ready for send()
+MOTOR_LAYOUT = _layout("V", "I", "P")
+AUTO_LAYOUT = _layout("error", "correction", "throttle", "V", "I", "P")
+
+
+class TelemetryBus:
+    """
+    Topic-keyed, latest-value-wins outbox between the control loop (or any
+    thread) and the WebSocket sender. Each topic holds at most one unsent
+    message: publishing again before it went out replaces it (counted as
+    "overwritten"), so memory is bounded by max_topics no matter how fast
+    or how varied the published values are.
+
+    min_interval is per topic: a message published sooner than that after
+    the last one released on the same topic is held ("rate_limited") and
+    released - still the newest value - once the interval is up, like
+    MotorCommandScheduler holds a rate-limited change.
+
+    All methods are thread-safe. The asyncio sender awaits wait(): the
+    first publish into an empty bus wakes it through
+    loop.call_soon_threadsafe(), later ones just join the pending set;
+    while messages are held it also wakes when the next one is due.
     """
-    Queues a message to be sent via the WebSocket, adhering to the specified interval.
-    
+
+    def __init__(self, max_topics: int = 32):
+        self.max_topics = max_topics
+        self._lock = Lock()
+        self._pending = {}        # topic -> message, insertion = release order
+        self._held = {}           # topic -> (message, due): waiting for min_interval
+        self._last_released = {}  # topic -> monotonic time
+        self._stats = {}          # topic -> [published, sent, overwritten, rate_limited]
+        self.rejected_topics = 0  # publishes dropped because max_topics was reached
+
+        # asyncio consumer (attach_loop): woken on empty -> non-empty
+        self._loop = None
+        self._ready = None
+        self.wakeups = 0
+
+    def publish(self, topic, message, min_interval: float = 0.0) -> bool:
+        """Returns True if the message is now the unsent one for topic (pending or held)."""
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats.get(topic)
+            if stats is None:
+                if len(self._stats) >= self.max_topics:
+                    self.rejected_topics += 1
+                    return False
+                stats = self._stats[topic] = [0, 0, 0, 0]
+            stats[0] += 1
+
+            if topic in self._pending:
+                # released but not sent yet: newest value goes out instead
+                stats[2] += 1
+                del self._pending[topic]   # re-insert: keep publish order
+                self._pending[topic] = message
+                return True
+
+            last = self._last_released.get(topic)
+            if last is not None and now - last < min_interval:
+                stats[3] += 1
+                if topic in self._held:
+                    stats[2] += 1
+                    wake = False
+                else:
+                    wake = self._loop is not None   # sender must re-arm its timeout
+                self._held[topic] = (message, last + min_interval)
+            else:
+                if self._held.pop(topic, None) is not None:
+                    stats[2] += 1
+                self._last_released[topic] = now
+                wake = not self._pending and self._loop is not None
+                self._pending[topic] = message
+
+        if wake:
+            try:
+                self._loop.call_soon_threadsafe(self._ready.set)
+            except RuntimeError:
+                pass   # loop already closed (shutdown)
+        return True
+
+    def drain(self):
+        """Takes every pending message (plus held ones now due), oldest release first."""
+        with self._lock:
+            if self._held:
+                now = time.monotonic()
+                for topic, (message, due) in list(self._held.items()):
+                    if due <= now:
+                        del self._held[topic]
+                        self._last_released[topic] = now
+                        self._pending[topic] = message
+            if not self._pending:
+                return []
+            messages = list(self._pending.values())
+            for topic in self._pending:
+                self._stats[topic][1] += 1
+            self._pending.clear()
+        return messages
+
+    def next_due(self):
+        """Seconds until the next held message is released, None if none is held."""
+        with self._lock:
+            if not self._held:
+                return None
+            due = min(d for _, d in self._held.values())
+        return max(0.0, due - time.monotonic())
+
+    def attach_loop(self, loop):
+        """Called from the consumer's loop before wait() is used."""
+        if self._loop is loop:
+            return
+        self._ready = asyncio.Event()
+        self._loop = loop
+
+    async def wait(self):
+        """Waits until something is published or a held message is due, then drains it."""
+        while True:
+            messages = self.drain()
+            if messages:
+                return messages
+            self.wakeups += 1
+            timeout = self.next_due()
+            if timeout is None:
+                await self._ready.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            self._ready.clear()
+
+    def pending(self) -> int:
+        """Unsent messages, pending or held."""
+        return len(self._pending) + len(self._held)
+
+    def stats(self):
+        """{topic: {published, sent, overwritten, rate_limited}}"""
+        with self._lock:
+            return {
+                str(topic): dict(zip(("published", "sent", "overwritten", "rate_limited"), s))
+                for topic, s in self._stats.items()
+            }
+
+
+# Process-wide bus used by main_client (producer) and RCDataDecoder (sender)
+bus = TelemetryBus()
+
+
+def send(message, min_interval: float = 0.0, topic="default"):
+    """
+    Publishes a message for the WebSocket sender.
+
     Args:
-        message (str): The text to send.
-        min_interval (float): Minimum time (in seconds) between sends of THIS specific message string.
-                              If 0, sends immediately (queued).
+        message (str | bytes): The text, or a binary TinyTLV frame, to send.
+        min_interval (float): Minimum time (in seconds) between messages on this topic.
+                              A message inside the interval is held and sent (if
+                              still the newest) when it ends. If 0, every publish
+                              replaces the pending one.
+        topic: Stream the message belongs to (e.g. "motor", "auto"); only the
+               newest unsent message of each topic is kept.
     """
-    global _last_sent_times
-
-    current_time = time.time()
-    
-    with _lock:
-        last_time = _last_sent_times.get(message, 0.0)
-        
-        if (current_time - last_time) >= min_interval:
-            _msg_queue.put(message)
-            _last_sent_times[message] = current_time
-
-def get_queue():
-    """Returns the underlying queue object (for consumer use)."""
-    return _msg_queue
+    return bus.publish(topic, message, min_interval)
+
+
+def drain():
+    """Pending messages, one per topic (for the consumer)."""
+    return bus.drain()
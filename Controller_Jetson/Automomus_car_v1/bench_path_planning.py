@@ -0,0 +1,81 @@
+# bench_path_planning.py
+# Center-point row scan: per-row np.where loop (reference_center_points) vs
+# the vectorized find_center_points(), for several strides and ROIs on
+# camera- and model-resolution masks. Equality check, then ms per frame.
+#   python3 bench_path_planning.py
+
+import time
+
+import numpy as np
+
+import config
+from PathPlanning import find_center_points
+from postprocess import mask_scale
+
+N_FRAMES = 200
+W, H = config.CAMERA_WIDTH, config.CAMERA_HEIGHT
+STEPS = [50, 25, 10, 5, 1]
+ROIS = [None, (0, int(H * 0.4), W, H), (W // 4, 100, 3 * W // 4 + 3, H - 7)]
+
+
+def reference_center_points(mask, step=50, roi=None):
+    """
+    The original per-row loop (np.where per sampled row) on a
+    camera-resolution mask.
+    """
+    x_lo, y_lo, x_hi, y_hi = roi or (0, 0, mask.shape[1], mask.shape[0])
+    center_points = []
+    rows = range(y_lo, y_hi, step)
+    for y in rows:
+        idx = np.where(mask[y, x_lo:x_hi] == 255)[0]
+        if len(idx):
+            center_points.append(((idx[0] + idx[-1]) // 2 + x_lo, y))
+    return center_points, len(rows)
+
+
+def path_masks(h, w, n, seed=0):
+    """Model-output-like masks: a wandering band with holes, plus an empty and a full one."""
+    rnd = np.random.RandomState(seed)
+    ys = np.arange(h)[:, None]
+    xs = np.arange(w)[None, :]
+    masks = [np.zeros((h, w), np.uint8), np.full((h, w), 255, np.uint8)]
+    for _ in range(n):
+        center = w * (0.5 + 0.4 * np.sin(ys / h * rnd.uniform(1, 6) + rnd.uniform(0, 6)))
+        band = np.abs(xs - center) < w * rnd.uniform(0.02, 0.2)
+        band &= rnd.rand(h, w) > 0.1
+        masks.append(band.astype(np.uint8) * 255)
+    return masks
+
+
+def check_equivalence():
+    for h, w in ((H, W), (config.MODEL_INPUT_H, config.MODEL_INPUT_W), (256, 320)):
+        for mask in path_masks(h, w, 10):
+            full = mask_scale(mask, W, H).upscale(mask)
+            for step in STEPS:
+                for roi in ROIS:
+                    got = find_center_points(mask, step, roi)
+                    expected = reference_center_points(full, step, roi)
+                    assert got == expected, (w, h, step, roi)
+        print(f"  {w}x{h} mask: identical for steps {STEPS} x {len(ROIS)} ROIs (12 masks)")
+
+
+def bench(fn, data):
+    t0 = time.perf_counter()
+    for k in range(N_FRAMES):
+        fn(data[k % len(data)])
+    return (time.perf_counter() - t0) * 1e3 / N_FRAMES
+
+
+if __name__ == "__main__":
+    print("--- equivalence ---")
+    check_equivalence()
+
+    full = path_masks(H, W, 8, seed=1)[2:]
+    model = path_masks(config.MODEL_INPUT_H, config.MODEL_INPUT_W, 8, seed=1)[2:]
+    print(f"--- ms per frame, {W}x{H} camera, {config.MODEL_INPUT_W}x{config.MODEL_INPUT_H} model mask ---")
+    print(f"{'step':>5} {'rows':>5} {'loop (camera)':>14} {'vector (camera)':>16} {'vector (model)':>15}")
+    for step in STEPS:
+        loop_ms = bench(lambda m: reference_center_points(m, step), full)
+        vec_ms = bench(lambda m: find_center_points(m, step), full)
+        model_ms = bench(lambda m: find_center_points(m, step), model)
+        print(f"{step:>5} {len(range(0, H, step)):>5} {loop_ms:>14.3f} {vec_ms:>16.3f} {model_ms:>15.3f}")
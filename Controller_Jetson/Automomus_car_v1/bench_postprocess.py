@@ -0,0 +1,86 @@
+# bench_postprocess.py
+# Mask postprocessing: original sigmoid + camera-size resize vs logit
+# threshold at model resolution (config.MASK_AT_MODEL_RES). Equality checks
+# for the mask, the lazy upscale and the path-planning row scan, then ms per
+# frame. No TensorRT/CUDA needed.
+#   python3 bench_postprocess.py
+
+import time
+
+import cv2
+import numpy as np
+
+import config
+from PathPlanning import find_center_points
+from postprocess import mask_scale, threshold_logits
+
+N_FRAMES = 300
+W, H = config.CAMERA_WIDTH, config.CAMERA_HEIGHT
+MODEL_SHAPES = [(config.MODEL_INPUT_H, config.MODEL_INPUT_W), (256, 320), (720, 1280)]
+
+
+def reference_postprocess(logits, out_w, out_h):
+    """
+    The original TensorRTUnetSegmentor._postprocess: sigmoid, > 0.5,
+    * 255, INTER_NEAREST resize to camera size.
+    """
+    with np.errstate(over="ignore"):   # exp(-x) -> inf for very negative x, prob 0
+        segmentation_probs = 1.0 / (1.0 + np.exp(-logits))
+    mask_np = (segmentation_probs[0, 0, :, :] > 0.5).astype(np.uint8) * 255
+    return cv2.resize(mask_np, (out_w, out_h), interpolation=cv2.INTER_NEAREST)
+
+
+def path_logits(h, w, rnd):
+    """Noisy logits with a wandering path band, as (1, 1, h, w) float32."""
+    ys = np.arange(h)[:, None]
+    xs = np.arange(w)[None, :]
+    center = w * (0.5 + 0.3 * np.sin(ys / h * rnd.uniform(1, 6) + rnd.uniform(0, 6)))
+    half = w * rnd.uniform(0.02, 0.2)
+    logits = 4.0 - np.abs(xs - center) / half * 4.0 + rnd.normal(0, 2.0, (h, w))
+    return logits.astype(np.float32)[None, None]
+
+
+def check_equivalence():
+    rnd = np.random.RandomState(1)
+    for h, w in MODEL_SHAPES:
+        for _ in range(20):
+            logits = path_logits(h, w, rnd)
+            expected = reference_postprocess(logits, W, H)
+
+            mask = threshold_logits(logits)
+            scale = mask_scale(mask, W, H)
+            assert np.array_equal(scale.upscale(mask), expected), (h, w)
+            assert find_center_points(mask) == find_center_points(expected), (h, w)
+        print(f"  {w}x{h} -> {W}x{H}: mask, upscale and center points identical (20 maps)")
+
+    # sigmoid(x) > 0.5 and x > 0 only part where float32 rounds:
+    # 1 / (1 + exp(-x)) is exactly 0.5 for 0 < x < ~1.2e-7, so the original
+    # called those pixels background; the logit threshold is exact
+    tiny = np.array([-1e-3, -1e-9, 0.0, 1e-9, 1e-7, 2e-7, 1e-3], dtype=np.float32)[None, None, None, :]
+    old = reference_postprocess(tiny, tiny.shape[-1], 1)[0]
+    new = threshold_logits(tiny)[0]
+    assert new.tolist() == [0, 0, 0, 255, 255, 255, 255], new.tolist()
+    assert old.tolist() == [0, 0, 0, 0, 0, 255, 255], old.tolist()
+    print(f"  {tiny.size} near-zero logits: identical except 0 < x < 1.2e-7 (sigmoid rounds to 0.5)")
+
+
+def bench(label, fn, data):
+    t0 = time.perf_counter()
+    for k in range(N_FRAMES):
+        fn(data[k % len(data)])
+    print(f"{label:<34} {(time.perf_counter() - t0) * 1e3 / N_FRAMES:7.3f} ms/frame")
+
+
+if __name__ == "__main__":
+    print("--- equivalence ---")
+    check_equivalence()
+
+    rnd = np.random.RandomState(2)
+    data = [path_logits(config.MODEL_INPUT_H, config.MODEL_INPUT_W, rnd) for _ in range(8)]
+    print(f"--- {config.MODEL_INPUT_W}x{config.MODEL_INPUT_H} logits -> {W}x{H} camera ---")
+    bench("sigmoid + resize (original)", lambda x: reference_postprocess(x, W, H), data)
+    bench("logit threshold, model res", threshold_logits, data)
+    bench("original + center points", lambda x: find_center_points(reference_postprocess(x, W, H)), data)
+    bench("model res + center points", lambda x: find_center_points(threshold_logits(x)), data)
+    masks = [threshold_logits(x) for x in data]
+    bench("lazy upscale (overlay only)", lambda m: mask_scale(m, W, H).upscale(m), masks)
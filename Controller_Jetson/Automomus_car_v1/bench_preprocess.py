@@ -0,0 +1,75 @@
+# bench_preprocess.py
+# Fused vs step-by-step U-Net preprocessing on CPU: equality check, ms per
+# frame and peak allocation per frame. No TensorRT/CUDA needed.
+#   python3 bench_preprocess.py
+
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+import config
+from preprocess import IMAGENET_MEAN, IMAGENET_STD, FusedPreprocessor
+
+N_FRAMES = 200
+H, W = config.MODEL_INPUT_H, config.MODEL_INPUT_W
+
+VARIANTS = [
+    ("marbel [0,1]", None, None),               # MODEL_PREPROCESS = True
+    ("road ImageNet", IMAGENET_MEAN, IMAGENET_STD),  # MODEL_PREPROCESS = False
+]
+
+
+def reference_preprocess(frame, input_h, input_w, mean=None, std=None):
+    """
+    The original step-by-step pipeline (TensorRTUnetSegmentor._preprocess /
+    _preprocess2): resize, cvtColor, astype, /255, (- mean) / std,
+    transpose, ravel.
+    """
+    input_frame = cv2.resize(frame, (input_w, input_h))
+    input_frame = cv2.cvtColor(input_frame, cv2.COLOR_BGR2RGB)
+    input_data = input_frame.astype(np.float32) / 255.0
+    if mean is not None:
+        input_data = (input_data - np.array(mean, dtype=np.float32)) / np.array(std, dtype=np.float32)
+    input_data = input_data.transpose((2, 0, 1))
+    return input_data.ravel()
+
+
+def frames(n=8, seed=0):
+    rnd = np.random.RandomState(seed)
+    return [rnd.randint(0, 256, (config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3), dtype=np.uint8)
+            for _ in range(n)]
+
+
+def peak_allocation(fn, frame):
+    """Peak bytes traced by tracemalloc during one call."""
+    fn(frame)  # warm up
+    tracemalloc.start()
+    fn(frame)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    data = frames()
+    # page-locked input_h_mem stand-in: flat float32, same size as the binding
+    host_mem = np.empty(3 * H * W, dtype=np.float32)
+
+    for name, mean, std in VARIANTS:
+        fused = FusedPreprocessor(H, W, host_mem, mean, std)
+
+        err = max(float(np.max(np.abs(fused(f) - reference_preprocess(f, H, W, mean, std)))) for f in data)
+        assert err < 1e-5, f"{name}: fused output differs by {err}"
+        print(f"--- {name}: max |fused - reference| = {err:.2e} ---")
+
+        # reference includes its np.copyto() into input_h_mem, as in infer()
+        reference = lambda f: np.copyto(host_mem, reference_preprocess(f, H, W, mean, std))
+        for label, fn in (("reference", reference), ("fused", fused)):
+            t0 = time.perf_counter()
+            for k in range(N_FRAMES):
+                fn(data[k % len(data)])
+            dt = (time.perf_counter() - t0) / N_FRAMES
+            peak = peak_allocation(fn, data[0])
+            print(f"{label:<10} {dt * 1e3:7.3f} ms/frame   peak traced {peak / 1024:9.1f} KiB/frame")
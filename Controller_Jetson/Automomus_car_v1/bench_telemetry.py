@@ -0,0 +1,46 @@
+# bench_telemetry.py
+# Encode cost and size of the per-tick telemetry message: f-string JSON
+# (TELEMETRY_FORMAT = "json") vs float32 TinyTLV frames ("tlv").
+#   python3 bench_telemetry.py
+
+import random
+import time
+
+import TelemetryOutput
+
+N = 100000
+
+
+def samples(seed=5):
+    rnd = random.Random(seed)
+    return [(rnd.uniform(-40, 40), rnd.uniform(-100, 100), rnd.randint(1000, 2000),
+             rnd.uniform(10.5, 12.6), rnd.uniform(-200, 3000), rnd.uniform(0, 40))
+            for _ in range(N)]
+
+
+def bench(name, fn, data):
+    t0 = time.perf_counter()
+    out = [fn(*s) for s in data]
+    dt = time.perf_counter() - t0
+    size = sum(len(m) for m in out) / len(out)
+    print(f"{name:<26} {dt * 1e6 / len(data):6.2f} us/msg  {size:6.1f} B/msg")
+
+
+if __name__ == "__main__":
+    data = samples()
+
+    print("--- MANUAL: motor telemetry (V, I, P) ---")
+    bench("f-string JSON",
+          lambda e, c, t, v, i, p: f'{{"motorTelemetry": {{"V": {v:.2f}, "I": {i:.2f}, "P": {p:.2f}}}}}'.encode(),
+          data)
+    bench("TinyTLV float32",
+          lambda e, c, t, v, i, p: TelemetryOutput.MOTOR_LAYOUT.pack((v, i, p)),
+          data)
+
+    print("--- AUTO: error, correction, throttle, V, I, P ---")
+    bench("f-string JSON",
+          lambda e, c, t, v, i, p: f'{{"error":{e},"correction":{c},"throttle":{t} ,"V": {v} ,"I": {i},"P":{p} }}'.encode(),
+          data)
+    bench("TinyTLV float32",
+          lambda e, c, t, v, i, p: TelemetryOutput.AUTO_LAYOUT.pack((e, c, t, v, i, p)),
+          data)
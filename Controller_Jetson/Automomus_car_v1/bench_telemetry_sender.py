@@ -0,0 +1,110 @@
+# bench_telemetry_sender.py
+# Telemetry sender wake-ups and publish -> websocket.send() latency: the old
+# sender_loop (drain(), asyncio.sleep(0.02) when empty) vs the current
+# RCDataDecoder.sender_loop() awaiting TelemetryBus.wait(). A producer
+# thread publishes like the control loop; the websocket is a stand-in that
+# records send times.
+#   python3 bench_telemetry_sender.py [seconds]
+
+import asyncio
+import struct
+import sys
+import threading
+import time
+
+import TelemetryOutput
+from latency_stats import LatencyHistogram
+from RCDataDecoder import RCDataDecoder
+from TelemetryOutput import TelemetryBus
+
+RATE = 10.0                  # publishes per second per topic
+TOPICS = ("motor", "auto")
+_STAMP = struct.Struct("<d")  # message = perf_counter() at publish
+
+
+class CountingBus(TelemetryBus):
+    def __init__(self):
+        super().__init__()
+        self.sender_wakeups = 0
+
+    async def wait(self):
+        messages = await super().wait()
+        self.sender_wakeups += 1
+        return messages
+
+
+class FakeWebSocket:
+    def __init__(self, hist):
+        self.hist = hist
+        self.sends = 0
+
+    async def send(self, message):
+        now = time.perf_counter()
+        self.sends += 1
+        for off in range(0, len(message), _STAMP.size):   # frames may be joined
+            self.hist.record_ns(int((now - _STAMP.unpack_from(message, off)[0]) * 1e9))
+
+
+async def polling_sender_loop(bus, websocket, counter):
+    """sender_loop() before the bus could be awaited."""
+    while True:
+        counter[0] += 1
+        messages = bus.drain()
+        if not messages:
+            await asyncio.sleep(0.02)
+            continue
+        for msg in messages:
+            await websocket.send(msg)
+
+
+def producer(bus, seconds):
+    start = time.perf_counter()
+    for k in range(int(seconds * RATE)):
+        for topic in TOPICS:
+            bus.publish(topic, _STAMP.pack(time.perf_counter()))
+        wait = start + (k + 1) / RATE - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+
+
+def run(polling, seconds):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    bus = TelemetryOutput.bus = CountingBus()   # sender_loop() uses the module's bus
+    hist = LatencyHistogram()
+    websocket = FakeWebSocket(hist)
+    counter = [0]
+    if polling:
+        task = loop.create_task(polling_sender_loop(bus, websocket, counter))
+    else:
+        task = loop.create_task(RCDataDecoder("ws://unused", loop).sender_loop(websocket))
+    loop.run_until_complete(asyncio.sleep(0.05))   # sender attached and idle
+
+    thread = threading.Thread(target=producer, args=(bus, seconds))
+    thread.start()
+    loop.run_until_complete(loop.run_in_executor(None, thread.join))
+    loop.run_until_complete(asyncio.sleep(0.05))   # last publish sent
+    task.cancel()
+    loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+    loop.close()
+
+    wakeups = counter[0] if polling else bus.sender_wakeups
+    assert hist.total == int(seconds * RATE) * len(TOPICS), hist.total
+    return wakeups, websocket.sends, hist
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    print(f"--- {len(TOPICS)} topics x {RATE:.0f} Hz for {seconds:.0f} s ---")
+    results = {}
+    for name, polling in (("polling", True), ("awaiting", False)):
+        wakeups, sends, hist = run(polling, seconds)
+        results[name] = (wakeups, hist)
+        s = hist.summary()
+        print(f"{name:<9} {wakeups:5d} wake-ups {sends:5d} sends   "
+              f"latency p50 {s['p50']:6.3f} ms  p99 {s['p99']:6.3f} ms  max {s['max']:6.3f} ms")
+
+    poll_wakeups, poll_hist = results["polling"]
+    await_wakeups, await_hist = results["awaiting"]
+    assert await_wakeups < poll_wakeups, (await_wakeups, poll_wakeups)
+    assert await_hist.percentile(50) < poll_hist.percentile(50)
@@ -0,0 +1,119 @@
+# bench_vision.py
+# Per-stage cost of one camera frame through the vision path (preprocess,
+# inference, postprocess, path planning, overlay, GStreamer buffer copy)
+# plus a regression check on synthetic frames with a known path. Runs on
+# any Linux box: inference uses the NumPy stub backend unless told otherwise.
+#   python3 bench_vision.py                      # stub backend
+#   python3 bench_vision.py onnxruntime          # config.ONNX_MODEL_PATH on CPU
+
+import sys
+import threading
+import time
+
+import numpy as np
+
+import config
+from inference_backends import StubBackend, make_backend
+from Model_unet import TensorRTUnetSegmentor
+from PathPlanning import calculate_steering_error, find_center_points, overlay
+from preprocess import IMAGENET_MEAN, IMAGENET_STD, FusedPreprocessor
+
+N_FRAMES = 100
+W, H = config.CAMERA_WIDTH, config.CAMERA_HEIGHT
+
+
+def path_frame(x_bottom, x_top, half_width=80, seed=0):
+    """Dark noisy frame with a bright straight band from x_bottom (last row) to x_top (row 0)."""
+    rnd = np.random.RandomState(seed)
+    frame = rnd.randint(0, 40, (H, W, 3), dtype=np.uint8)
+    ys = np.arange(H)
+    centers = x_top + (x_bottom - x_top) * ys / (H - 1)
+    xs = np.arange(W)[None, :]
+    band = np.abs(xs - centers[:, None]) <= half_width
+    frame[band] = 220
+    return frame, centers
+
+
+def check_regression(segmentor):
+    """The stub must find the band: center points on the band, steering sign right."""
+    cases = [
+        ("straight", W // 2, W // 2, 0),
+        ("left", W // 2, W // 4, -1),
+        ("right", W // 2, 3 * W // 4, +1),
+    ]
+    bottom = (W // 2, H - 1)
+    for name, x_bottom, x_top, sign in cases:
+        frame, centers = path_frame(x_bottom, x_top)
+        mask = segmentor.infer(frame)
+        points, n_rows = find_center_points(mask)
+        assert len(points) == n_rows, f"{name}: path found in {len(points)}/{n_rows} rows"
+        err = max(abs(x - centers[y]) for x, y in points)
+        # nearest-neighbour up/down scaling through the 384x384 model input
+        assert err <= 8, f"{name}: center points off by {err:.1f} px"
+        angle = calculate_steering_error(bottom, points[config.LOOK_AHEAD])
+        assert (sign == 0 and abs(angle) < 1.0) or angle * sign > 1.0, f"{name}: angle {angle:.1f} deg"
+        print(f"  {name:<9} {n_rows} rows, max center error {err:4.1f} px, angle {angle:+6.1f} deg")
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    backend_name = sys.argv[1] if len(sys.argv) > 1 else "stub"
+    if backend_name == "stub":
+        backend = StubBackend(config.MODEL_INPUT_H, config.MODEL_INPUT_W)
+    else:
+        backend = make_backend(backend_name, config.ENGINE_FILE_PATH, config.ONNX_MODEL_PATH,
+                               config.MODEL_INPUT_H, config.MODEL_INPUT_W)
+    segmentor = TensorRTUnetSegmentor(None, config.MODEL_INPUT_H, config.MODEL_INPUT_W, W, H,
+                                      backend=backend)
+    # the segmentor's own slot-0 preprocessing, timed on its own
+    mean, std = (None, None) if config.MODEL_PREPROCESS else (IMAGENET_MEAN, IMAGENET_STD)
+    preprocess = FusedPreprocessor(config.MODEL_INPUT_H, config.MODEL_INPUT_W, backend.input_host, mean, std)
+
+    if backend_name == "stub":
+        print("--- regression (stub backend) ---")
+        check_regression(segmentor)
+
+    state_lock = threading.Lock()
+    shared_state = {"angle": 0.0, "center_points": [], "vp_y": int(H * 0.6), "center": (W // 2, H - 1)}
+
+    frames = [path_frame(W // 2, x_top, seed=k)[0] for k, x_top in enumerate((W // 3, W // 2, 2 * W // 3))]
+    stages = ("preprocess", "inference", "postprocess", "path planning", "overlay", "stream copy")
+    times = {s: [] for s in stages}
+
+    for k in range(N_FRAMES):
+        frame = frames[k % len(frames)]
+        _, dt = timed(preprocess, frame)
+        times["preprocess"].append(dt)
+        logits, dt = timed(backend.infer)
+        times["inference"].append(dt)
+        mask, dt = timed(segmentor._postprocess, logits)
+        times["postprocess"].append(dt)
+
+        t0 = time.perf_counter()
+        points, _ = find_center_points(mask)
+        if len(points) > config.LOOK_AHEAD:
+            angle = calculate_steering_error(shared_state["center"], points[config.LOOK_AHEAD])
+            with state_lock:
+                shared_state["angle"] = angle
+                shared_state["center_points"] = points
+        times["path planning"].append(time.perf_counter() - t0)
+
+        out, dt = timed(overlay, frame, mask, state_lock, shared_state)
+        times["overlay"].append(dt)
+        # what the transmitter does before Gst.Buffer.new_wrapped()
+        _, dt = timed(lambda f: np.ascontiguousarray(f).tobytes(), out)
+        times["stream copy"].append(dt)
+
+    print(f"--- {N_FRAMES} frames {W}x{H}, model input "
+          f"{config.MODEL_INPUT_W}x{config.MODEL_INPUT_H}, backend {backend_name} ---")
+    total = 0.0
+    for s in stages:
+        ms = np.asarray(times[s]) * 1e3
+        total += float(np.median(ms))
+        print(f"{s:<14} p50 {np.median(ms):7.3f} ms   p99 {np.percentile(ms, 99):7.3f} ms")
+    print(f"{'sum of p50':<14}     {total:7.3f} ms")
@@ -0,0 +1,109 @@
+# check_event_loop_latency.py
+# RC arrival -> send_motor_command latency of the control loop, polling
+# (TickScheduler ticks only) vs event-driven (EVENT_DRIVEN_CONTROL: also
+# woken by RCDataDecoder.wait_for_data). A local websockets server stands
+# in for the relay and sends timestamped RC frames; RCDataDecoder.run()
+# receives them through handle_message() as in main_client.
+#   python3 check_event_loop_latency.py [frames]
+
+import asyncio
+import sys
+
+import websockets
+
+import config
+from latency_stats import LatencyHistogram, now_ns
+from RCDataDecoder import RC_LAYOUT, RCDataDecoder
+from tick_scheduler import TickScheduler
+
+# not a multiple of the 20 ms tick, so arrivals sweep across the tick phase
+FRAME_INTERVAL = 0.023
+
+
+class StampingSender:
+    """Stand-in for SerialSender: records when each command was handed over."""
+
+    def __init__(self):
+        self.sent_ns = None
+
+    def send_motor_command(self, direction, speed_L, speed_R):
+        self.sent_ns = now_ns()
+        return True
+
+
+async def rc_source(websocket, n_frames):
+    """Server side: n_frames RC frames, u32 ms timestamp in channel 100."""
+    for k in range(n_frames):
+        ts = int(asyncio.get_event_loop().time() * 1000) & 0xFFFFFFFF
+        await websocket.send(RC_LAYOUT.pack([1500 + k % 500] * 7 + [ts]))
+        await asyncio.sleep(FRAME_INTERVAL)
+    await websocket.wait_closed()   # until the client goes away
+
+
+async def control(client, event_driven, n_frames, hist):
+    """The main_client wake-up + send path, without the mixer/PID/telemetry."""
+    ticker = TickScheduler(config.CONTROL_TICK_PERIOD)
+    sender = StampingSender()
+    last_seq = client.seq
+    acted = 0
+    while client.seq < n_frames or last_seq != client.seq:
+        if event_driven:
+            await ticker.wait(lambda timeout: client.wait_for_data(last_seq, timeout))
+        else:
+            await ticker.wait()
+        seq = client.seq
+        if seq != last_seq and client.get_latest_data():
+            sender.send_motor_command(1, 100, 100)
+            hist.record_ns(sender.sent_ns - client.recv_ns)
+            acted += 1
+        last_seq = seq
+    return acted
+
+
+def run(event_driven, n_frames):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    async def handler(websocket, path=None):   # path: websockets < 10 (Jetson)
+        await rc_source(websocket, n_frames)
+
+    async def start_server():   # websockets >= 14 needs the loop running
+        return await websockets.serve(handler, "127.0.0.1", 0)
+
+    server = loop.run_until_complete(start_server())
+    port = server.sockets[0].getsockname()[1]
+    client = RCDataDecoder(f"ws://127.0.0.1:{port}", loop)
+    loop.create_task(client.run())
+
+    hist = LatencyHistogram()
+    acted = loop.run_until_complete(
+        asyncio.wait_for(control(client, event_driven, n_frames, hist), n_frames * FRAME_INTERVAL + 10))
+
+    # run() leaves its sender_loop() task behind when cancelled
+    all_tasks = getattr(asyncio, "all_tasks", None) or asyncio.Task.all_tasks   # 3.6
+    tasks = [t for t in all_tasks(loop) if not t.done()]
+    for task in tasks:
+        task.cancel()
+    server.close()
+    loop.run_until_complete(asyncio.gather(*tasks, server.wait_closed(), return_exceptions=True))
+    loop.close()
+
+    mode = "event" if event_driven else "poll"
+    print(f"  {mode:<5} {acted}/{client.seq} frames acted on, arrival -> send_motor_command "
+          f"{hist.summary()}")
+    return hist.percentile(50), acted, client.seq
+
+
+def main():
+    n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    poll_p50, _, _ = run(False, n_frames)
+    event_p50, acted, received = run(True, n_frames)
+    # polling waits for the next tick: ~half a period on average
+    assert event_p50 < 0.5 * poll_p50, (event_p50, poll_p50)
+    assert acted == received == n_frames, (acted, received)
+    print(f"  median {poll_p50:.2f} ms -> {event_p50:.2f} ms")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# check_motor_scheduler.py
+# MotorCommandScheduler on a scripted clock: duplicate suppression,
+# keepalives, the max_rate limit, stop(), and what happens when the
+# sender fails a write (the command must be retried, not deduplicated
+# or "kept alive" as if it had gone out).
+#   python3 check_motor_scheduler.py
+
+from serialSender import MotorCommandScheduler
+
+KEEPALIVE = 0.2
+MAX_RATE = 100.0   # 10 ms between packets
+
+
+class FakeSender:
+    """Records accepted packets; fail_next makes the next writes return False."""
+
+    def __init__(self):
+        self.packets = []
+        self.fail_next = 0
+
+    def send_motor_command(self, direction, speed_L, speed_R):
+        if self.fail_next:
+            self.fail_next -= 1
+            return False
+        self.packets.append((direction, speed_L, speed_R))
+        return True
+
+
+def scheduler():
+    sender = FakeSender()
+    return MotorCommandScheduler(sender, keepalive_interval=KEEPALIVE, max_rate=MAX_RATE), sender
+
+
+def check_dedup_and_keepalive():
+    sched, sender = scheduler()
+    assert sched.send(1, 100, 100, now=0.0)
+    for k in range(1, 10):   # same command every 20 ms tick
+        assert not sched.send(1, 100, 100, now=k * 0.02)
+    assert sched.send(1, 100, 100, now=0.2)            # keepalive due
+    assert not sched.poll(now=0.3)
+    assert sched.poll(now=0.4)                          # keepalive without send()
+    assert sender.packets == [(1, 100, 100)] * 3
+    stats = sched.stats()
+    assert stats == {"sent": 3, "keepalives": 2, "suppressed": 9, "rate_limited": 0, "failed": 0}, stats
+    print(f"  dedup + keepalive: {stats}")
+
+
+def check_rate_limit_and_stop():
+    sched, sender = scheduler()
+    assert sched.send(1, 100, 100, now=0.0)
+    assert not sched.send(1, 110, 110, now=0.004)      # held by max_rate
+    assert not sched.send(1, 120, 120, now=0.008)      # newer change replaces the held one
+    assert sched.poll(now=0.010)
+    assert sched.stop(now=0.011)                        # stop ignores the rate limit
+    assert not sched.stop(now=0.05)                     # repeated stop deduplicated
+    assert sched.stop(now=0.011 + KEEPALIVE)            # ... until the keepalive interval
+    assert sender.packets == [(1, 100, 100), (1, 120, 120), (0, 0, 0), (0, 0, 0)], sender.packets
+    print(f"  rate limit + stop: {sched.stats()}")
+
+
+def check_failed_write():
+    sched, sender = scheduler()
+    assert sched.send(1, 100, 100, now=0.0)
+
+    # a change whose write fails is retried on the next tick, not dropped as a duplicate
+    sender.fail_next = 1
+    assert not sched.send(1, 150, 150, now=0.02)
+    assert sched.send(1, 150, 150, now=0.04)
+    assert sender.packets[-1] == (1, 150, 150)
+
+    # a failed change stays held: poll() retries it instead of a keepalive of the old one
+    sender.fail_next = 1
+    assert not sched.send(1, 180, 180, now=0.06)
+    assert sched.poll(now=0.3)
+    assert sender.packets[-1] == (1, 180, 180)
+
+    # a failed keepalive is retried at once, not a keepalive interval later
+    sender.fail_next = 1
+    assert not sched.poll(now=0.5)
+    assert sched.poll(now=0.52)
+    assert sender.packets[-1] == (1, 180, 180)
+
+    # a failed stop is not deduplicated
+    sender.fail_next = 1
+    assert not sched.stop(now=0.53)
+    assert sched.stop(now=0.54)
+    assert sender.packets[-1] == (0, 0, 0)
+
+    stats = sched.stats()
+    assert stats["failed"] == 4 and stats["sent"] == len(sender.packets) == 5, stats
+    print(f"  failed writes retried: {stats}")
+
+
+if __name__ == "__main__":
+    check_dedup_and_keepalive()
+    check_rate_limit_and_stop()
+    check_failed_write()
+    print("OK")
@@ -0,0 +1,109 @@
+# check_onnx_backend.py
+# Smoke test for OnnxRuntimeBackend through TensorRTUnetSegmentor: shapes,
+# synchronous infer() against the pipelined submit()/flush() path, and -
+# with the generated model - the mask itself. Skipped (exit 0) when
+# onnxruntime is not installed.
+#   python3 check_onnx_backend.py                # config.ONNX_MODEL_PATH
+#   python3 check_onnx_backend.py model.onnx
+# Without the model file, a one-layer stand-in (channel mean > 0.5 = path)
+# is generated with the onnx package, if that is installed.
+
+import os
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+import config
+
+N_FRAMES = 6
+W, H = config.CAMERA_WIDTH, config.CAMERA_HEIGHT
+
+
+def skip(reason):
+    print(f"SKIP: {reason}")
+    sys.exit(0)
+
+
+def make_mean_model(path, input_h, input_w):
+    """1x1 conv: logits = mean(R, G, B) - 0.5 on the [0, 1] input."""
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    weight = numpy_helper.from_array(np.full((1, 3, 1, 1), 1.0 / 3.0, np.float32), "weight")
+    bias = numpy_helper.from_array(np.array([-0.5], np.float32), "bias")
+    graph = helper.make_graph(
+        [helper.make_node("Conv", ["input", "weight", "bias"], ["logits"])],
+        "mean_model",
+        [helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 3, input_h, input_w])],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, [1, 1, input_h, input_w])],
+        initializer=[weight, bias],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 7   # loadable by older onnxruntime builds (JetPack wheels)
+    onnx.save(model, path)
+
+
+def expected_mask(frame, input_h, input_w):
+    """What the generated model must give: channel mean of the resized [0, 1] frame > 0.5."""
+    resized = cv2.resize(frame, (input_w, input_h)).astype(np.float32) / 255.0
+    return (resized.mean(axis=2) > 0.5).astype(np.uint8) * 255
+
+
+def main():
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        skip("onnxruntime is not installed")
+
+    from inference_backends import OnnxRuntimeBackend
+    from Model_unet import TensorRTUnetSegmentor
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else config.ONNX_MODEL_PATH
+    generated = not os.path.exists(model_path)
+    if generated:
+        try:
+            import onnx  # noqa: F401
+        except ImportError:
+            skip(f"{model_path} not found and the onnx package is not installed to generate one")
+        model_path = os.path.join(tempfile.mkdtemp(), "mean_model.onnx")
+        make_mean_model(model_path, config.MODEL_INPUT_H, config.MODEL_INPUT_W)
+
+    depth = 2
+    backend = OnnxRuntimeBackend(model_path, slots=depth)
+    input_h, input_w = backend.input_shape[2:]
+    assert backend.input_host.size == int(np.prod(backend.input_shape)), backend.input_shape
+    assert len(backend.input_hosts) == depth and len(backend.output_shape) == 4, backend.output_shape
+    print(f"  {os.path.basename(model_path)}: input {backend.input_shape}, output {backend.output_shape}")
+
+    segmentor = TensorRTUnetSegmentor(None, input_h, input_w, W, H, backend=backend, pipeline_depth=depth)
+    rnd = np.random.RandomState(0)
+    frames = [rnd.randint(0, 256, (H, W, 3), dtype=np.uint8) for _ in range(N_FRAMES)]
+
+    masks = [segmentor.infer(frame) for frame in frames]
+    out_h, out_w = backend.output_shape[2:] if config.MASK_AT_MODEL_RES else (H, W)
+    for mask in masks:
+        assert mask.dtype == np.uint8 and mask.shape == (out_h, out_w), (mask.dtype, mask.shape)
+
+    # pipelined: same masks, same order
+    piped = []
+    for k, frame in enumerate(frames):
+        result = segmentor.submit(frame, k)
+        if result is not None:
+            piped.append(result)
+    piped += segmentor.flush()
+    assert [tag for tag, _ in piped] == list(range(N_FRAMES))
+    assert all(np.array_equal(a, b) for a, b in zip(masks, (mask for _, mask in piped)))
+    print(f"  infer() and submit()/flush() (depth {depth}) agree on {N_FRAMES} frames")
+
+    if generated and config.MODEL_PREPROCESS and config.MASK_AT_MODEL_RES:
+        # (R + G + B) / 765 is never within float error of 0.5, so exact
+        for frame, mask in zip(frames, masks):
+            assert np.array_equal(mask, expected_mask(frame, input_h, input_w))
+        print("  generated model: mask is mean(R, G, B) > 0.5")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
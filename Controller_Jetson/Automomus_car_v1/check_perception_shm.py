@@ -0,0 +1,87 @@
+# check_perception_shm.py
+# Cross-process torn-read stress check for PerceptionShm: one writer
+# process as fast as it can, reader processes validating every field of
+# every sample against the sequence number. Run it on the target (the
+# Jetson is aarch64 - weakly ordered stores, unlike an x86 dev box).
+#   python3 check_perception_shm.py [writes] [readers]
+
+import multiprocessing as mp
+import sys
+import time
+
+from perception_shm import MAX_CENTER_POINTS, PerceptionShm
+
+
+def sample_fields(k):
+    """Every field of write k derives from k, so a mix of two writes is detectable."""
+    n = k % (MAX_CENTER_POINTS + 1)
+    return float(k), float(k) * 0.5, [(k, -k)] * n, (k % 1000) / 1000.0
+
+
+def writer(shm, n_writes):
+    for k in range(1, n_writes + 1):
+        angle, frame_ts, points, confidence = sample_fields(k)
+        shm.write(angle, frame_ts, points, confidence)
+        if k % 4 == 0:
+            time.sleep(0)   # let readers in between writes too, not only during them
+
+
+def reader(shm, stop, results):
+    reads = fresh = torn = 0
+    last_seq = None
+    while not stop.is_set():
+        sample = shm.read(last_seq)
+        reads += 1
+        if sample is None:
+            continue
+        fresh += 1
+        k = int(sample.angle)
+        angle, frame_ts, points, confidence = sample_fields(k)
+        if (sample.seq != 2 * k or sample.frame_ts != frame_ts
+                or sample.confidence != confidence or sample.center_points != points):
+            torn += 1
+        if last_seq is not None and sample.seq <= last_seq:
+            torn += 1   # went backwards
+        last_seq = sample.seq
+    results.put((reads, fresh, torn))
+
+
+def main():
+    n_writes = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n_readers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    mp.set_start_method("spawn", force=True)   # as launcher.py
+    shm = PerceptionShm()
+    stop = mp.Event()
+    results = mp.Queue()
+
+    readers = [mp.Process(target=reader, args=(shm, stop, results)) for _ in range(n_readers)]
+    for r in readers:
+        r.start()
+    time.sleep(0.5)   # readers polling before the first write
+
+    t0 = time.perf_counter()
+    w = mp.Process(target=writer, args=(shm, n_writes))
+    w.start()
+    w.join()
+    dt = time.perf_counter() - t0
+    stop.set()
+
+    total_fresh = total_torn = 0
+    print(f"writer: {n_writes} writes, {n_writes / dt:.0f} writes/s")
+    for _ in readers:
+        reads, fresh, torn = results.get()
+        total_fresh += fresh
+        total_torn += torn
+        print(f"reader: {reads} reads, {fresh} fresh samples, {torn} torn")
+    for r in readers:
+        r.join()
+
+    assert shm.read().seq == 2 * n_writes
+    assert total_fresh > 0, "readers never saw a sample"
+    assert total_torn == 0, f"{total_torn} torn reads"
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
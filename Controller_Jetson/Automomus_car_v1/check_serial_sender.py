@@ -0,0 +1,86 @@
+# check_serial_sender.py
+# SerialSender on a pty (pty.openpty(), Linux): does a control task that
+# sends a motor command every 2 ms stall the event loop? Measures the gap
+# between 1 ms loop ticks with synchronous writes and with the writer
+# thread (async_writes=True), and checks what reached the "STM32" side.
+# No hardware needed.
+#   python3 check_serial_sender.py
+
+import asyncio
+import os
+import pty
+import time
+
+from serialSender import SerialSender, motor_packet
+
+N_TICKS = 400
+N_COMMANDS = 200
+
+
+async def ticker(gaps):
+    last = time.perf_counter()
+    for _ in range(N_TICKS):
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def control(sender):
+    for k in range(N_COMMANDS):
+        sender.send_motor_command(1, k % 256, k % 256)
+        await asyncio.sleep(0.002)
+
+
+def run(async_writes):
+    master, slave = pty.openpty()
+    os.set_blocking(master, False)
+    sender = SerialSender(port=os.ttyname(slave), async_writes=async_writes)
+    assert sender.open_serial()
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    gaps = []
+
+    async def both():
+        await asyncio.gather(ticker(gaps), control(sender))
+    loop.run_until_complete(both())
+    loop.close()
+
+    sender.stop()
+    sender.close_serial()   # async: drains the mailbox first
+    received = b''
+    while True:
+        try:
+            chunk = os.read(master, 65536)
+        except (BlockingIOError, OSError):
+            break
+        if not chunk:
+            break
+        received += chunk
+    os.close(master)
+    os.close(slave)
+
+    gaps.sort()
+    p50 = gaps[len(gaps) // 2] * 1e3
+    p99 = gaps[int(len(gaps) * 0.99)] * 1e3
+    mode = "async" if async_writes else "sync"
+    print(f"  {mode:<5} loop gap p50 {p50:5.2f} ms  p99 {p99:5.2f} ms  writes {sender.write_stats()}")
+
+    # whole packets only, init packet first, stop() last
+    assert len(received) % 4 == 0, len(received)
+    assert received[:4] == bytes([0xAA, 0, 0, 0])
+    assert received[-4:] == motor_packet(0, 0, 0), received[-4:].hex()
+    return p50
+
+
+def main():
+    sync_p50 = run(False)
+    async_p50 = run(True)
+    # sync: every send blocks the loop for write + flush + packet_delay (2 ms)
+    assert async_p50 < 0.75 * sync_p50, (async_p50, sync_p50)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# check_serial_transport.py
+# SerialTransport end to end on a pty (pty.openpty(), Linux): the master
+# side plays the STM32. Checks telemetry parsing across split frames,
+# latest-command-wins writes, and that a hangup takes the fd off the loop
+# instead of spinning in _on_readable(). No hardware needed.
+#   python3 check_serial_transport.py
+
+import asyncio
+import os
+import pty
+import struct
+import time
+import tty
+
+from serialSender import motor_packet
+from serial_transport import SerialTransport
+
+N_SAMPLES = 50
+# after a hangup the reader must be gone, not called in a busy loop
+MAX_CALLS_AFTER_HANGUP = 5
+
+
+def telemetry_frame(bus_raw, cur_raw):
+    return struct.pack('>BHhB', 0x55, bus_raw, cur_raw, 0x0A)
+
+
+async def fake_stm32(master, transport):
+    """Telemetry every ~2 ms, each frame split over two writes; one command per frame."""
+    received = b''
+    for k in range(N_SAMPLES):
+        frame = telemetry_frame(8000 + k, k)
+        os.write(master, frame[:3])
+        await asyncio.sleep(0.001)
+        os.write(master, frame[3:])
+        await asyncio.sleep(0.001)
+        transport.send_motor_command(1, k, k)
+        try:
+            received += os.read(master, 4096)
+        except BlockingIOError:
+            pass
+    await asyncio.sleep(0.01)
+    try:
+        received += os.read(master, 4096)
+    except BlockingIOError:
+        pass
+    return received
+
+
+def main():
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    os.set_blocking(master, False)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    samples, closed = [], []
+    transport = SerialTransport(port=os.ttyname(slave), loop=loop,
+                                on_telemetry=samples.append, on_close=closed.append)
+
+    calls = [0]
+    on_readable = transport._on_readable
+
+    def counting_on_readable():
+        calls[0] += 1
+        on_readable()
+    transport._on_readable = counting_on_readable   # registered by open_serial()
+
+    assert transport.open_serial()
+    received = loop.run_until_complete(fake_stm32(master, transport))
+
+    # --- telemetry ---
+    assert len(samples) == N_SAMPLES, transport.telemetry_stats()
+    assert transport.telemetry.resyncs == 0
+    v, i, p = transport.read_telemetry()
+    assert i == (N_SAMPLES - 1) * 0.4, (v, i, p)
+    print(f"  telemetry: {len(samples)} samples from split frames, {transport.telemetry_stats()}")
+
+    # --- commands: init packet, then whole 4-byte packets ending with the last one ---
+    assert received[:4] == bytes([0xAA, 0, 0, 0])
+    assert len(received) % 4 == 0 and received[-4:] == motor_packet(1, N_SAMPLES - 1, N_SAMPLES - 1)
+    print(f"  commands: {len(received) // 4} packets, {transport.write_stats()}")
+
+    # --- hangup: master closed -> EOF/EIO on the slave fd ---
+    os.close(master)
+    calls[0] = 0
+    t0 = time.perf_counter()
+    loop.run_until_complete(asyncio.sleep(0.5))
+    assert transport.closed and closed == [transport.close_reason], (transport.closed, closed)
+    assert calls[0] <= MAX_CALLS_AFTER_HANGUP, f"_on_readable called {calls[0]} times after hangup"
+    assert not transport.send_motor_command(1, 10, 10)
+    print(f"  hangup: {transport.close_reason!r}, _on_readable called {calls[0]} time(s) "
+          f"in {time.perf_counter() - t0:.1f} s")
+
+    transport.close_serial()
+    loop.close()
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
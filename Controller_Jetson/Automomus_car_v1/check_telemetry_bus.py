@@ -0,0 +1,107 @@
+# check_telemetry_bus.py
+# TelemetryBus checks: min_interval keeps and later delivers the newest
+# value of a topic, the asyncio sender wakes for it without a new
+# publish, and memory stays flat over millions of sends from two threads.
+#   python3 check_telemetry_bus.py [sends]
+
+import asyncio
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+import TelemetryOutput
+from TelemetryOutput import TelemetryBus
+
+INTERVAL = 0.05
+# allowed growth of traced memory between the first and last checkpoint
+MAX_GROWTH = 64 * 1024
+
+
+def check_latest_value_wins():
+    bus = TelemetryBus()
+    assert bus.publish("auto", "a1", INTERVAL)
+    assert bus.drain() == ["a1"]
+
+    # inside the interval: held, each newer value replaces the held one
+    for k in range(2, 6):
+        assert bus.publish("auto", f"a{k}", INTERVAL)
+    bus.publish("motor", "m1", INTERVAL)   # other topic is not limited by "auto"
+    assert bus.drain() == ["m1"]
+    assert bus.pending() == 1 and bus.next_due() > 0
+
+    time.sleep(INTERVAL)
+    assert bus.drain() == ["a5"], "newest held value must go out when the interval ends"
+    stats = bus.stats()["auto"]
+    assert stats == {"published": 5, "sent": 2, "overwritten": 3, "rate_limited": 4}, stats
+    print(f"  held value delivered at interval end, stats {stats}")
+
+
+def check_sender_wakes_for_held():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    bus = TelemetryBus()
+    bus.attach_loop(loop)
+    sent = []
+
+    async def sender():
+        for _ in range(2):
+            for message in await bus.wait():
+                sent.append((message, time.monotonic()))
+
+    def producer():
+        bus.publish("auto", "first", INTERVAL)
+        time.sleep(0.005)
+        bus.publish("auto", "second", INTERVAL)   # held; no publish after it
+        bus.publish("auto", "third", INTERVAL)
+
+    t0 = time.monotonic()
+    thread = threading.Thread(target=producer)
+    thread.start()
+    loop.run_until_complete(asyncio.wait_for(sender(), 1.0))
+    thread.join()
+    loop.close()
+
+    assert [m for m, _ in sent] == ["first", "third"], sent
+    delay = sent[1][1] - t0
+    assert INTERVAL <= delay < INTERVAL + 0.03, delay
+    print(f"  sender woke for the held message after {delay * 1e3:.1f} ms (interval {INTERVAL * 1e3:.0f} ms)")
+
+
+def check_memory_flat(n_sends):
+    rnd = random.Random(1)
+    per_thread = n_sends // 4   # 2 threads x 2 topics
+
+    def producer(seed):
+        r = random.Random(seed)
+        for k in range(per_thread):
+            TelemetryOutput.send(TelemetryOutput.MOTOR_LAYOUT.pack((r.random(), r.random(), k)), 0.0, "motor")
+            TelemetryOutput.send(f'{{"error":{r.random()}}}', 0.001, "auto")
+            if k % 100 == 0:
+                TelemetryOutput.drain()
+
+    tracemalloc.start()
+    checkpoints = []
+    for step in range(5):
+        threads = [threading.Thread(target=producer, args=(rnd.random(),)) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        checkpoints.append(tracemalloc.get_traced_memory()[0])
+        print(f"  {(step + 1) * n_sends:>9} sends  traced {checkpoints[-1] / 1024:7.1f} KiB")
+    tracemalloc.stop()
+
+    growth = checkpoints[-1] - checkpoints[0]
+    assert growth < MAX_GROWTH, f"memory grew by {growth / 1024:.1f} KiB"
+    assert TelemetryOutput.bus.pending() <= 2
+    print(f"  growth after the first {n_sends} sends: {growth / 1024:.1f} KiB, {TelemetryOutput.bus.stats()}")
+
+
+if __name__ == "__main__":
+    n_sends = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+    check_latest_value_wins()
+    check_sender_wakes_for_held()
+    check_memory_flat(n_sends)
+    print("OK")
@@ -0,0 +1,106 @@
+# clock_sync.py
+# Continuous clock-offset / skew estimation for RC packet latency.
+
+import collections
+import time
+
+
+def _signed32(value: int) -> int:
+    value &= 0xFFFFFFFF
+    return value - 0x100000000 if value >= 0x80000000 else value
+
+
+class ClockSync:
+    """
+    Estimates the offset between the sender's clock (the RC packet
+    "timestamp", lower 32 bits of epoch ms) and the Jetson's clock from the
+    stream of (remote_ts, local arrival) pairs - NTP-style minimum filter:
+
+      diff = local_arrival - remote_ts = clock_offset + one_way_delay
+
+    The smallest diff in a sliding window is the packet that saw the least
+    queueing, so   offset ~= min(diff) - base_latency_ms.   Window minima are
+    kept per bucket (fixed memory); a least-squares fit over bucket minima
+    gives the skew between the two clocks, which is used to carry the
+    offset forward instead of letting it drift.
+
+    base_latency_ms is the assumed one-way latency of that best packet -
+    with timestamps in one direction only it cannot be observed, so the
+    reported latency is exact in its variations and relative to that floor.
+    """
+
+    def __init__(self, window_s: float = 10.0, bucket_s: float = 1.0,
+                 skew_history_s: float = 120.0, base_latency_ms: float = 30.0,
+                 max_skew_ppm: float = 500.0):
+        self.bucket_s = bucket_s
+        self.max_skew = max_skew_ppm / 1000.0
+        self.window_buckets = max(1, int(window_s / bucket_s))
+        self.base_latency_ms = base_latency_ms
+
+        # (bucket_start_s, min_diff_ms, local_s of that min), newest last
+        self._buckets = collections.deque(maxlen=max(self.window_buckets, int(skew_history_s / bucket_s)))
+
+        self.offset_ms = None   # remote -> local clock offset
+        self.skew = 0.0         # ms of offset drift per second of local time
+        self.latency_ms = 0.0   # corrected one-way latency of the last packet
+        self.jitter_ms = 0.0    # RFC 3550 style interarrival jitter
+        self._last_transit = None
+
+    @property
+    def skew_ppm(self) -> float:
+        return self.skew * 1000.0
+
+    def update(self, remote_ts: int, local_ms: int = None, now_s: float = None) -> float:
+        """
+        Feeds one packet: remote_ts and local_ms are the lower 32 bits of
+        epoch ms (packet "timestamp" and "arrival_ts"). Returns latency_ms.
+        now_s (monotonic seconds) is only passed when replaying.
+        """
+        if now_s is None:
+            now_s = time.monotonic()
+        if local_ms is None:
+            local_ms = int(time.time() * 1000) & 0xFFFFFFFF
+        diff = _signed32(local_ms - remote_ts)
+
+        # jitter: smoothed |change in transit time| between packets
+        if self._last_transit is not None:
+            self.jitter_ms += (abs(diff - self._last_transit) - self.jitter_ms) / 16.0
+        self._last_transit = diff
+
+        # windowed minimum, one entry per bucket
+        bucket = now_s - (now_s % self.bucket_s)
+        if self._buckets and self._buckets[-1][0] == bucket:
+            if diff < self._buckets[-1][1]:
+                self._buckets[-1] = (bucket, diff, now_s)
+        else:
+            self._buckets.append((bucket, diff, now_s))
+            self._fit_skew()
+
+        recent = list(self._buckets)[-self.window_buckets:]
+        _, min_diff, min_at = min(recent, key=lambda b: b[1])
+        self.offset_ms = min_diff + self.skew * (now_s - min_at) - self.base_latency_ms
+
+        self.latency_ms = max(0.0, diff - self.offset_ms)
+        return self.latency_ms
+
+    def _fit_skew(self):
+        """Least-squares slope of bucket minima over the skew history."""
+        points = list(self._buckets)[:-1]   # newest bucket is still filling
+        if len(points) < 4:
+            return
+        n = len(points)
+        mean_t = sum(p[2] for p in points) / n
+        mean_d = sum(p[1] for p in points) / n
+        var_t = sum((p[2] - mean_t) ** 2 for p in points)
+        if var_t <= 0:
+            return
+        skew = sum((p[2] - mean_t) * (p[1] - mean_d) for p in points) / var_t
+        self.skew = max(-self.max_skew, min(self.max_skew, skew))
+
+    def stats(self) -> dict:
+        return {
+            "offset_ms": None if self.offset_ms is None else round(self.offset_ms, 2),
+            "skew_ppm": round(self.skew_ppm, 1),
+            "latency_ms": round(self.latency_ms, 2),
+            "jitter_ms": round(self.jitter_ms, 2),
+        }
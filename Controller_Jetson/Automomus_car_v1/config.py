@@ -8,6 +8,12 @@ WS_URI = "ws://yadiec2.freedynamicdns.net:8080/ws"
 HEALTH_URL = "http://yadiec2.freedynamicdns.net:8080/health"
 SERIAL_PORT = "/dev/ttyUSB0"
 BAUD_RATE = 115200
+SERIAL_ASYNC_WRITES = False  # True: motor commands written by a thread, loop never blocks on the UART (verify on the car first)
+SERIAL_ASYNCIO = False       # True: serial_transport.SerialTransport (event-loop reads/writes)
+MOTOR_KEEPALIVE_INTERVAL = 0.2  # s, resend an unchanged command (STM32 MOTOR_TIMEOUT is 1 s)
+MOTOR_MAX_RATE = 100.0          # motor packets per second, 0 = unlimited
+RC_CAPTURE_PATH = None      # e.g. "rc_capture.ttlv" to record raw RC traffic for replay
+TELEMETRY_FORMAT = "tlv"    # "tlv" = binary float32 TinyTLV frames, "json" = old JSON strings
 
 RUN_VISION_PROCESS =False
 # ===========================
@@ -17,6 +23,27 @@ MODE = "MANUAL"
 HEALTH_CHECK_INTERVAL = 2.0
 AUTO_MODE_TRIGGER = 1700    # If Aux1 > 1700, switch to AUTO
 
+# AUTO mode vs perception age (camera capture -> now). "slow": scale
+# throttle towards neutral past PERCEPTION_SLOW_AGE; "stop": only the stop
+# age applies; "ignore": old behaviour. Past PERCEPTION_STOP_AGE (or with no
+# perception at all) the car stops under "slow" and "stop".
+PERCEPTION_STALE_POLICY = "slow"
+PERCEPTION_SLOW_AGE = 0.25          # seconds
+PERCEPTION_SLOW_THROTTLE_SCALE = 0.5
+PERCEPTION_STOP_AGE = 0.6           # seconds
+
+# Control loop wake-up: ticks every CONTROL_TICK_PERIOD on absolute deadlines
+# (failsafe, health and AUTO mode keep running when no frames arrive);
+# EVENT_DRIVEN_CONTROL = True also wakes the loop on every new RC frame
+EVENT_DRIVEN_CONTROL = True
+CONTROL_TICK_PERIOD = 0.02
+FAILSAFE_TIMEOUT = 1.0      # seconds without a new RC packet before motors stop
+CONTROL_LATENCY_REPORT_INTERVAL = 10.0   # seconds, 0 = off
+
+# RC packet latency: clock offset/skew estimated continuously (clock_sync.py)
+CLOCK_SYNC_WINDOW = 10.0        # seconds of min-filter window
+CLOCK_SYNC_BASE_LATENCY_MS = 30 # assumed one-way latency of the fastest packet
+
 # ===========================
 # PID CONTROLLER CONFIGURATION
 # ===========================
@@ -36,8 +63,14 @@ CAMERA_INDEX = 0
 USE_OVERLAY = True
 
 ENGINE_FILE_PATH = "unet_mobilenetv2_Marbel.engine"
+INFERENCE_BACKEND = "tensorrt"   # "tensorrt" | "onnxruntime" (CPU) | "stub" (synthetic, no model)
+ONNX_MODEL_PATH = "unet_mobilenetv2_Marbel.onnx"
+INFERENCE_PIPELINE_DEPTH = 1   # frames in flight (bindings + CUDA stream each), 1 = synchronous.
+                               # 2 overlaps preprocessing with the GPU but adds ~1 camera frame of
+                               # perception age (66 ms at 15 fps, vs PERCEPTION_SLOW_AGE); not yet run on the Jetson
 MODEL_INPUT_H = 384
 MODEL_INPUT_W = 384
+MASK_AT_MODEL_RES = True  # keep the U-Net mask at model size, upscale only for the overlay
 MODEL_PREPROCESS = True  #True= marbel model preprocesss , False for road model preprocess function
 # ===========================
 # AV STREAMING (GSTREAMER)
@@ -64,6 +97,8 @@ FRAME_DURATION = int(1e9 / CAMERA_FPS)
 # AUTONOMOUS NAVIGATION
 # ===========================
 LOOK_AHEAD = 1  # Number of points to look ahead for steering
+PATH_SCAN_STEP = 50     # scan every Nth camera row for path center points (LOOK_AHEAD counts these)
+PATH_SCAN_ROI = None    # (x0, y0, x1, y1) camera pixels, end exclusive; None = whole frame
 EMA_ALPHA = 0.7 # Exponential Moving Average Filter (0.1 - 1.0) 1.0 = No Filter
 EMA_ALPHA_ERROR = 0.7        # small → clean vision noise
 EMA_ALPHA_CORRECTION = 0.6   # smaller → smoother motors
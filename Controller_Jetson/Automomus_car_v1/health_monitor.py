@@ -4,13 +4,22 @@ import aiohttp
 import time
 
 class HealthMonitor:
-    def __init__(self, endpoint_url, interval=1.0,loop=None):
+    def __init__(self, endpoint_url, interval=1.0,loop=None, stage_latency=None, clock_sync=None, serial_sender=None,
+                 command_scheduler=None, telemetry_bus=None, perception_latency=None,
+                 tick_scheduler=None):
         self.url = endpoint_url
         self.interval = interval
         self.last_report_time = 0
         self.container_status = "RUNNING"
         self._session = None
         self.loop = loop
+        self.stage_latency = stage_latency  # latency_stats.StageLatency, optional
+        self.clock_sync = clock_sync        # clock_sync.ClockSync, optional
+        self.serial_sender = serial_sender  # serialSender.SerialSender, optional
+        self.command_scheduler = command_scheduler  # serialSender.MotorCommandScheduler, optional
+        self.telemetry_bus = telemetry_bus  # TelemetryOutput.TelemetryBus, optional
+        self.perception_latency = perception_latency  # latency_stats.LatencyHistogram, optional
+        self.tick_scheduler = tick_scheduler  # tick_scheduler.TickScheduler, optional
 
     
     async def _get_session(self):
@@ -29,6 +38,24 @@ class HealthMonitor:
             "connected": True,
             "up_time": int(time.time()), 
         }
+        if self.stage_latency is not None:
+            # p50/p95/p99 per RC path stage (ms)
+            payload["stage_latency_ms"] = self.stage_latency.summary()
+        if self.clock_sync is not None:
+            payload["jitter_ms"] = round(self.clock_sync.jitter_ms, 2)
+            payload["clock_skew_ppm"] = round(self.clock_sync.skew_ppm, 1)
+        if self.serial_sender is not None:
+            payload["serial_write_ms"] = self.serial_sender.write_stats()
+            payload["telemetry"] = self.serial_sender.telemetry_stats()
+        if self.command_scheduler is not None:
+            payload["motor_commands"] = self.command_scheduler.stats()
+        if self.telemetry_bus is not None:
+            payload["telemetry_out"] = self.telemetry_bus.stats()
+        if self.perception_latency is not None and self.perception_latency.total:
+            # AUTO: camera capture -> motor command (ms)
+            payload["perception_latency_ms"] = self.perception_latency.summary()
+        if self.tick_scheduler is not None:
+            payload["control_tick"] = self.tick_scheduler.stats()
         try:
             session = await self._get_session()
             async with session.post(self.url, json=payload, timeout=1.0) as response:
@@ -0,0 +1,198 @@
+# inference_backends.py
+# Inference engines behind TensorRTUnetSegmentor.infer(). Heavy imports
+# (tensorrt, pycuda, onnxruntime) happen in the backend constructors, so the
+# rest of the vision path imports and runs on any machine.
+#
+# Every backend exposes:
+#   input_host   flat float32 (or float16) array the preprocessor fills
+#   output_shape model output shape, e.g. (1, 1, H, W) logits
+#   infer()      runs the model on input_host, returns the logits array
+#                (reshaped to output_shape, valid until the next call)
+#
+# and, for the pipelined mode (inference_pipeline.py), `slots` independent
+# buffer sets:
+#   input_hosts[slot]  per-slot input_host (input_host is input_hosts[0])
+#   submit(slot)       starts the model on input_hosts[slot], returns at once
+#                      where the backend can run asynchronously
+#   collect(slot)      waits for that slot, returns its logits (valid until
+#                      the slot is submitted again)
+# infer() is submit(0) + collect(0).
+
+import time
+
+import numpy as np
+
+
+class TensorRTBackend:
+    """
+    Serialized TensorRT engine. Each slot has its own execution context,
+    page-locked host + device bindings and CUDA stream; submit() queues
+    htod copy -> execute_async_v2 -> dtoh copy on the slot's stream, so
+    the CPU is free until collect() synchronizes it.
+    """
+
+    def __init__(self, engine_path, slots=1):
+        import tensorrt as trt
+        import pycuda.driver as cuda
+        import pycuda.autoinit  # noqa: F401  (creates the CUDA context)
+        self._cuda = cuda
+
+        # 1. Load Engine
+        print(f"Loading TensorRT engine from {engine_path}...")
+        runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
+        with open(engine_path, "rb") as f:
+            self.engine = runtime.deserialize_cuda_engine(f.read())
+
+        if not self.engine:
+            raise RuntimeError(f"Failed to load TensorRT engine from {engine_path}")
+        print("Engine loaded successfully.")
+
+        # 2. Allocate I/O buffers (Host and Device) per slot. A context must
+        #    not run on two streams at once, so every slot gets its own.
+        self.slots = slots
+        self.contexts = []
+        self.streams = []
+        self.bindings = []
+        self.input_hosts, self.input_devices = [], []
+        self.output_hosts, self.output_devices = [], []
+        for _ in range(slots):
+            self.contexts.append(self.engine.create_execution_context())
+            self.streams.append(cuda.Stream())
+            bindings = []
+            for binding in self.engine:
+                size = trt.volume(self.engine.get_binding_shape(binding)) * self.engine.max_batch_size
+                dtype = trt.nptype(self.engine.get_binding_dtype(binding))
+
+                # Host memory (Page-locked: required for async copies)
+                host_mem = cuda.pagelocked_empty(size, dtype)
+                # Device memory
+                device_mem = cuda.mem_alloc(host_mem.nbytes)
+
+                bindings.append(int(device_mem))
+
+                if self.engine.binding_is_input(binding):
+                    self.input_shape = tuple(self.engine.get_binding_shape(binding))
+                    self.input_hosts.append(host_mem)
+                    self.input_devices.append(device_mem)
+                else:
+                    self.output_shape = tuple(self.engine.get_binding_shape(binding))
+                    self.output_hosts.append(host_mem)
+                    self.output_devices.append(device_mem)
+            self.bindings.append(bindings)
+
+        self.input_host = self.input_hosts[0]
+        n_out = int(np.prod(self.output_shape))
+        self._output_views = [h[:n_out].reshape(self.output_shape) for h in self.output_hosts]
+
+    def submit(self, slot=0):
+        cuda = self._cuda
+        stream = self.streams[slot]
+        cuda.memcpy_htod_async(self.input_devices[slot], self.input_hosts[slot], stream)
+        self.contexts[slot].execute_async_v2(bindings=self.bindings[slot], stream_handle=stream.handle)
+        cuda.memcpy_dtoh_async(self.output_hosts[slot], self.output_devices[slot], stream)
+
+    def collect(self, slot=0):
+        self.streams[slot].synchronize()
+        return self._output_views[slot]
+
+    def infer(self):
+        self.submit(0)
+        return self.collect(0)
+
+
+class OnnxRuntimeBackend:
+    """
+    ONNX export of the same U-Net on onnxruntime (CPU by default).
+    session.run() is synchronous, so submit() does the work and the
+    pipelined mode only rotates buffers here.
+    """
+
+    def __init__(self, model_path, providers=("CPUExecutionProvider",), slots=1):
+        import onnxruntime as ort
+
+        self.session = ort.InferenceSession(model_path, providers=list(providers))
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # dynamic batch dimension -> 1
+        self.input_shape = tuple(d if isinstance(d, int) else 1 for d in model_input.shape)
+        self.output_shape = tuple(
+            d if isinstance(d, int) else 1 for d in self.session.get_outputs()[0].shape
+        )
+        self.slots = slots
+        self.input_hosts = [np.empty(int(np.prod(self.input_shape)), dtype=np.float32)
+                            for _ in range(slots)]
+        self.input_host = self.input_hosts[0]
+        self._feeds = [{self.input_name: h.reshape(self.input_shape)} for h in self.input_hosts]
+        self._outputs = [None] * slots
+
+    def submit(self, slot=0):
+        self._outputs[slot] = self.session.run(None, self._feeds[slot])[0].reshape(self.output_shape)
+
+    def collect(self, slot=0):
+        return self._outputs[slot]
+
+    def infer(self):
+        self.submit(0)
+        return self.collect(0)
+
+
+class StubBackend:
+    """
+    Synthetic stand-in for benchmarking and checking everything around the
+    model. Logits = (channel mean - its frame average) * gain, i.e. bright
+    areas segment as "path". delay (seconds) emulates GPU time: submit()
+    returns at once and collect() sleeps until the slot is done. Slots
+    queue behind each other like kernels on one GPU, so only CPU work
+    overlaps the delay.
+    """
+
+    def __init__(self, input_h, input_w, output_shape=None, delay=0.0, gain=10.0, slots=1):
+        self.input_shape = (1, 3, input_h, input_w)
+        self.output_shape = tuple(output_shape or (1, 1, input_h, input_w))
+        self.delay = delay
+        self.gain = np.float32(gain)
+        self.slots = slots
+
+        self.input_hosts = [np.empty(3 * input_h * input_w, dtype=np.float32) for _ in range(slots)]
+        self.input_host = self.input_hosts[0]
+        self._mean = np.empty((input_h, input_w), dtype=np.float32)
+        self._outputs = [np.empty(self.output_shape, dtype=np.float32) for _ in range(slots)]
+        self._ready_at = [0.0] * slots
+        self._gpu_free_at = 0.0
+
+        out_h, out_w = self.output_shape[-2:]
+        self._rows = np.linspace(0, input_h - 1, out_h).astype(np.intp)[:, None]
+        self._cols = np.linspace(0, input_w - 1, out_w).astype(np.intp)[None, :]
+
+    def submit(self, slot=0):
+        chw = self.input_hosts[slot].reshape(self.input_shape[1:])
+        mean = self._mean
+        np.add(chw[0], chw[1], out=mean)
+        np.add(mean, chw[2], out=mean)
+        mean *= np.float32(1.0 / 3.0)
+        mean -= mean.mean()
+        mean *= self.gain
+        self._outputs[slot][0, 0] = mean[self._rows, self._cols]
+        self._gpu_free_at = max(time.perf_counter(), self._gpu_free_at) + self.delay
+        self._ready_at[slot] = self._gpu_free_at
+
+    def collect(self, slot=0):
+        wait = self._ready_at[slot] - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        return self._outputs[slot]
+
+    def infer(self):
+        self.submit(0)
+        return self.collect(0)
+
+
+def make_backend(name, engine_path=None, onnx_path=None, input_h=384, input_w=384, slots=1):
+    """config.INFERENCE_BACKEND -> backend instance with `slots` buffer sets."""
+    if name == "tensorrt":
+        return TensorRTBackend(engine_path, slots=slots)
+    if name == "onnxruntime":
+        return OnnxRuntimeBackend(onnx_path, slots=slots)
+    if name == "stub":
+        return StubBackend(input_h, input_w, slots=slots)
+    raise ValueError(f"unknown inference backend: {name!r}")
@@ -0,0 +1,83 @@
+# inference_pipeline.py
+# Depth-N software pipeline over the slots of an inference backend
+# (inference_backends.py). No TensorRT/CUDA imports: scheduling and buffer
+# rotation run the same against StubBackend (see bench_pipeline.py).
+
+from collections import deque
+
+
+class InferencePipeline:
+    """
+    Keeps up to depth - 1 frames on the backend while the next one is
+    preprocessed. push() of frame N:
+
+        1. preprocess N into the next free slot   (frame N-1 still on the GPU)
+        2. backend.submit(slot)                   (returns at once)
+        3. once depth frames are in flight, backend.collect() the oldest
+           and return (its tag, its logits)
+
+    so results come out in submission order, depth - 1 frames late.
+    depth = 1 is the synchronous path (submit + collect of the same frame).
+
+    The returned logits live in the slot's output buffer, which the backend
+    reuses when that slot is submitted again - use them (postprocess)
+    before the next push(). The tag is carried through untouched (e.g.
+    the frame and its capture time).
+
+        pipeline = InferencePipeline(backend, 2, preprocessors)
+        for frame in frames:
+            result = pipeline.push(frame, tag)
+            if result is not None:
+                tag, logits = result
+        for tag, logits in pipeline.flush():
+            ...
+    """
+
+    def __init__(self, backend, depth, preprocessors):
+        if depth < 1:
+            raise ValueError(f"pipeline depth must be >= 1, got {depth}")
+        if backend.slots < depth or len(preprocessors) < depth:
+            raise ValueError(
+                f"pipeline depth {depth} needs {depth} backend slots and preprocessors "
+                f"(have {backend.slots} and {len(preprocessors)})"
+            )
+        self.backend = backend
+        self.depth = depth
+        self.preprocessors = preprocessors
+
+        self._next_slot = 0
+        self._in_flight = deque()   # (slot, tag), oldest first
+
+        self.submitted = 0
+        self.collected = 0
+
+    def __len__(self):
+        """Frames submitted but not collected yet."""
+        return len(self._in_flight)
+
+    def push(self, frame, tag=None):
+        """Submits frame; returns (tag, logits) of the oldest frame once the pipeline is full, else None."""
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.depth
+
+        self.preprocessors[slot](frame)
+        self.backend.submit(slot)
+        self._in_flight.append((slot, tag))
+        self.submitted += 1
+
+        if len(self._in_flight) >= self.depth:
+            return self._collect_oldest()
+        return None
+
+    def flush(self):
+        """Collects every frame still in flight, oldest first."""
+        results = []
+        while self._in_flight:
+            results.append(self._collect_oldest())
+        return results
+
+    def _collect_oldest(self):
+        slot, tag = self._in_flight.popleft()
+        logits = self.backend.collect(slot)
+        self.collected += 1
+        return tag, logits
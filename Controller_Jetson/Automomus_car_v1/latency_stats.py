@@ -0,0 +1,129 @@
+# latency_stats.py
+# Fixed-memory latency histograms for the RC control path.
+
+import threading
+from typing import Dict
+
+from tinytlvx import now_ns  # monotonic ns, Python 3.6 fallback included
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of microsecond values: exact below 32 us,
+    then 16 linear sub-buckets per power of two (~6% resolution). Memory is
+    fixed (a few hundred ints) no matter how many samples are recorded.
+    """
+    SUB_BUCKET_BITS = 4
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    def __init__(self, max_us: int = 10000000):
+        self.max_us = max_us
+        self.counts = [0] * (self._index(max_us) + 1)
+        self.total = 0
+        self.max_seen = 0
+
+    def _index(self, us: int) -> int:
+        if us < 2 * self.SUB_BUCKETS:
+            return us
+        e = us.bit_length() - self.SUB_BUCKET_BITS - 1
+        return e * self.SUB_BUCKETS + (us >> e)
+
+    def _value(self, index: int) -> int:
+        """Middle of the bucket, in us."""
+        if index < 2 * self.SUB_BUCKETS:
+            return index
+        e = index // self.SUB_BUCKETS - 1
+        m = index % self.SUB_BUCKETS + self.SUB_BUCKETS
+        return (m << e) + ((1 << e) >> 1)
+
+    def record_ns(self, ns: int):
+        us = min(max(ns // 1000, 0), self.max_us)
+        self.counts[self._index(us)] += 1
+        self.total += 1
+        if us > self.max_seen:
+            self.max_seen = us
+
+    def percentile(self, p: float) -> float:
+        """Value at percentile p (0-100), in ms. 0.0 if empty."""
+        if not self.total:
+            return 0.0
+        rank = max(1, int(self.total * p / 100.0 + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._value(index), self.max_seen) / 1000.0
+        return self.max_seen / 1000.0
+
+    def summary(self) -> Dict[str, float]:
+        """{"p50", "p95", "p99", "max" (ms, 3 decimals), "count"} - the shape every stats() reports."""
+        return {
+            "p50": round(self.percentile(50), 3),
+            "p95": round(self.percentile(95), 3),
+            "p99": round(self.percentile(99), 3),
+            "max": round(self.max_seen / 1000.0, 3),
+            "count": self.total,
+        }
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.max_seen = 0
+
+
+class StageLatency:
+    """
+    One histogram per stage of the RC path. Each RC frame is stamped with
+    now_ns() at:
+        recv   - WebSocket message received (RCDataDecoder.handle_message)
+        decode - TinyTLV frame decoded
+        mixer  - motor command computed by the control loop
+        serial - the UART write() of that command returned
+    and the differences are recorded as recv->decode, decode->mixer,
+    mixer->serial and recv->serial (total).
+
+    The serial stamp comes from the sender, which writes either inside
+    send_motor_command() or later from a writer thread / the loop: the
+    control loop calls command_sent() when a frame's command was handed to
+    the sender (not when MotorCommandScheduler suppressed it), the
+    sender's on_written hook calls packet_written(), and whichever comes
+    second completes the record (matched by queued_ns >= mixer_ns).
+    """
+    STAGES = ("decode", "control", "serial", "total")
+
+    def __init__(self):
+        self.hist = {stage: LatencyHistogram() for stage in self.STAGES}
+        self._lock = threading.Lock()
+        self._pending = None   # (recv_ns, decode_ns, mixer_ns) waiting for its write
+        self._written = None   # (queued_ns, written_ns) of the last write, not matched yet
+
+    def command_sent(self, recv_ns: int, decode_ns: int, mixer_ns: int):
+        """Control loop: this frame's motor command went to the sender."""
+        with self._lock:
+            written = self._written
+            if written is not None and written[0] >= mixer_ns:
+                # synchronous sender: already on the wire
+                self._written = None
+                self.record_frame(recv_ns, decode_ns, mixer_ns, written[1])
+            else:
+                self._pending = (recv_ns, decode_ns, mixer_ns)
+
+    def packet_written(self, queued_ns: int, written_ns: int):
+        """Sender (any thread): a packet queued at queued_ns left write() at written_ns."""
+        with self._lock:
+            pending = self._pending
+            if pending is not None and queued_ns >= pending[2]:
+                self._pending = None
+                self.record_frame(pending[0], pending[1], pending[2], written_ns)
+            else:
+                self._written = (queued_ns, written_ns)   # keepalive / stop, or sent before command_sent()
+
+    def record_frame(self, recv_ns: int, decode_ns: int, mixer_ns: int, serial_ns: int):
+        self.hist["decode"].record_ns(decode_ns - recv_ns)
+        self.hist["control"].record_ns(mixer_ns - decode_ns)
+        self.hist["serial"].record_ns(serial_ns - mixer_ns)
+        self.hist["total"].record_ns(serial_ns - recv_ns)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{stage: LatencyHistogram.summary()} - used by HealthMonitor."""
+        return {stage: h.summary() for stage, h in self.hist.items()}
@@ -4,37 +4,98 @@ import asyncio
 import sys
 import time
 
-from serialSender import SerialSender
+from serialSender import SerialSender, MotorCommandScheduler
+from serial_transport import SerialTransport
 from RCDataDecoder import RCDataDecoder
 from rc_mixer import RCMixer
 from health_monitor import HealthMonitor
 from PID_Controll import PID
+from latency_stats import StageLatency, LatencyHistogram, now_ns
+from clock_sync import ClockSync
+from tick_scheduler import TickScheduler
 import TelemetryOutput
 import config
 
 
-async def main(shared_angle, shared_seq, loop):
+def stale_perception_throttle(throttle, age):
+    """
+    AUTO throttle for a perception result `age` seconds old (None = vision
+    never produced one). Past PERCEPTION_STOP_AGE the car stops; past
+    PERCEPTION_SLOW_AGE throttle is scaled towards neutral (1500).
+    Returns (throttle, stop).
+    """
+    policy = config.PERCEPTION_STALE_POLICY
+    if policy == "ignore":
+        return throttle, False
+    if age is None or age > config.PERCEPTION_STOP_AGE:
+        return 1500, True
+    if policy == "slow" and age > config.PERCEPTION_SLOW_AGE:
+        return int(1500 + (throttle - 1500) * config.PERCEPTION_SLOW_THROTTLE_SCALE), False
+    return throttle, False
+
+
+async def main(perception, loop):
     # ------------------ SERIAL ------------------
-    motor_serial = SerialSender(
-        port=config.SERIAL_PORT,
-        baudrate=config.BAUD_RATE
-    )
+    if config.SERIAL_ASYNCIO:
+        # telemetry parsed as soon as it arrives, writes never block the loop
+        # the loop only reads the newest sample (read_telemetry()): no queue
+        motor_serial = SerialTransport(
+            port=config.SERIAL_PORT,
+            baudrate=config.BAUD_RATE,
+            loop=loop,
+            queue_size=0
+        )
+    else:
+        motor_serial = SerialSender(
+            port=config.SERIAL_PORT,
+            baudrate=config.BAUD_RATE,
+            async_writes=config.SERIAL_ASYNC_WRITES
+        )
 
     if not motor_serial.open_serial():
         print("❌ Failed to open serial port. Exiting.")
         sys.exit(1)
 
+    # unchanged commands are only resent as keepalives, bounded packet rate
+    motor_cmd = MotorCommandScheduler(
+        motor_serial,
+        keepalive_interval=config.MOTOR_KEEPALIVE_INTERVAL,
+        max_rate=config.MOTOR_MAX_RATE
+    )
+
+    # fixed-rate control ticks on absolute deadlines (+ early wake on RC frames)
+    ticker = TickScheduler(config.CONTROL_TICK_PERIOD, loop)
+
     # ------------------ HEALTH ------------------
+    # per-stage RC path latency: WebSocket recv -> decode -> mixer -> serial
+    stage_latency = StageLatency()
+    motor_serial.on_written = stage_latency.packet_written
+    # AUTO: camera capture -> motor command built from that frame
+    perception_latency = LatencyHistogram()
+    # packet timestamp vs local arrival -> corrected one-way latency + jitter
+    clock_sync = ClockSync(
+        window_s=config.CLOCK_SYNC_WINDOW,
+        base_latency_ms=config.CLOCK_SYNC_BASE_LATENCY_MS
+    )
+
     health = HealthMonitor(
         endpoint_url=config.HEALTH_URL,
         interval=config.HEALTH_CHECK_INTERVAL,
-        loop=loop      # IMPORTANT
+        loop=loop,     # IMPORTANT
+        stage_latency=stage_latency,
+        clock_sync=clock_sync,
+        serial_sender=motor_serial,
+        command_scheduler=motor_cmd,
+        telemetry_bus=TelemetryOutput.bus,
+        perception_latency=perception_latency,
+        tick_scheduler=ticker
     )
 
     # ------------------ WEBSOCKET ------------------
     client = RCDataDecoder(
         ws_uri=config.WS_URI,
-        loop=loop      # IMPORTANT
+        loop=loop,     # IMPORTANT
+        capture_path=config.RC_CAPTURE_PATH
     )
 
     # Start receiver task (Python 3.6 SAFE)
@@ -51,24 +112,48 @@ async def main(shared_angle, shared_seq, loop):
 
     last_processed_timestamp = -1
     last_valid_packet_local_time = time.time()
-    clock_offset = None
     latency = 0
     ema_error = 0.0
     ema_error_initialized = False
 
     ema_correction = 0.0
     ema_correction_initialized = False
+
+    last_perception_seq = None
+    perception_frame_ts = None   # capture time of the sample the PID last used
+    filtered_error = 0.0
+
+    last_seq = client.seq
+    v, i, p = 0.0, 0.0, 0.0   # last motor telemetry (V, mA, W)
+    last_latency_report = time.time()
  
     print("🚀 Motor Control System Started. Waiting for data...")
 
     try:
         while True:
-            await asyncio.sleep(0.02)
+            if config.EVENT_DRIVEN_CONTROL:
+                await ticker.wait(lambda timeout: client.wait_for_data(last_seq, timeout))
+            else:
+                await ticker.wait()
+            if config.SERIAL_ASYNCIO and motor_serial.closed:
+                # port hung up (SerialTransport took it off the loop)
+                print(f"❌ Serial port lost ({motor_serial.close_reason}). Exiting.")
+                break
+            seq = client.seq
+            fresh_frame = seq != last_seq
+            last_seq = seq
 
             data = client.get_latest_data()
             # print(data)
             now = time.time()
 
+            if (config.CONTROL_LATENCY_REPORT_INTERVAL
+                    and now - last_latency_report > config.CONTROL_LATENCY_REPORT_INTERVAL):
+                total = stage_latency.hist["total"]
+                print(f"⏱️ RC arrival -> motor cmd: p50 {total.percentile(50):.2f} ms | "
+                      f"p95 {total.percentile(95):.2f} ms | p99 {total.percentile(99):.2f} ms")
+                last_latency_report = now
+
             # ------------------ HEALTH ------------------
             health.update(
                 int(latency),
@@ -77,13 +162,12 @@ async def main(shared_angle, shared_seq, loop):
 
             if not data:
                 continue
-             # ------------------ Read voltage and current from motor ------------------
+            # ------------------ Read voltage and current from motor ------------------
+            # newest sample since the last tick; keep the previous one if none arrived
             try:
                 tele_data = motor_serial.read_telemetry()
-                if tele_data is None:
-                    continue   # No more full packets in the buffer
-                
-                v, i, p = tele_data
+                if tele_data is not None:
+                    v, i, p = tele_data
                 # status = "Charging" if i < 0 else "Discharging"
                 # # Logic for health monitor or logging
                 # print(f"[{status}] {v:.2f}V | {i:.1f}mA")
@@ -93,13 +177,7 @@ async def main(shared_angle, shared_seq, loop):
             packet_ts = data.get("timestamp")
             if packet_ts is not None:
                 if packet_ts != last_processed_timestamp:
-                    current_local_ms = int(now * 1000) & 0xFFFFFFFF
-                    raw_diff = (current_local_ms - packet_ts) & 0xFFFFFFFF
-                    
-                    if clock_offset is None:
-                        clock_offset = raw_diff - 30
-                    
-                    latency = (raw_diff - clock_offset) & 0xFFFFFFFF
+                    latency = clock_sync.update(packet_ts, data.get("arrival_ts"))
                     last_valid_packet_local_time = now
                     last_processed_timestamp = packet_ts
                    
@@ -116,63 +194,93 @@ async def main(shared_angle, shared_seq, loop):
             # ------------------ MODE ------------------
             aux1 = data.get("Aux1", 1000)
 
+            new_sample = False   # AUTO consumed a new perception result this tick
             if aux1 < config.AUTO_MODE_TRIGGER:
                 # MANUAL
                 throttle = data.get("Pitch", 1500)
                 roll = data.get("Roll", 1500)
                 # print(data)
-                json_string = f'{{"motorTelemetry": {{"V": {v:.2f}, "I": {i:.2f}, "P": {p:.2f}}}}}'
-
-                TelemetryOutput.send(json_string, 0.1)   
+                if config.TELEMETRY_FORMAT == "tlv":
+                    TelemetryOutput.send(TelemetryOutput.MOTOR_LAYOUT.pack((v, i, p)), 0.1, "motor")
+                else:
+                    json_string = f'{{"motorTelemetry": {{"V": {v:.2f}, "I": {i:.2f}, "P": {p:.2f}}}}}'
+                    TelemetryOutput.send(json_string, 0.1, "motor")
             else:
                 # AUTO
-                raw_error = float(shared_angle.value)
-
-                # -------- EMA on ERROR (input smoothing) --------
-                if not ema_error_initialized:
-                    ema_error = raw_error
-                    ema_error_initialized = True
-                else:
-                    ema_error = (
-                        config.EMA_ALPHA_ERROR * raw_error +
-                        (1.0 - config.EMA_ALPHA_ERROR) * ema_error
-                    )
-
-                filtered_error = ema_error
-
-                # -------- PID --------
-                raw_correction = steering_pid.compute(filtered_error)
-
-                # -------- EMA on CORRECTION (output smoothing) --------
-                if not ema_correction_initialized:
-                    ema_correction = raw_correction
-                    ema_correction_initialized = True
-                else:
-                    ema_correction = (
-                        config.EMA_ALPHA_CORRECTION * raw_correction +
-                        (1.0 - config.EMA_ALPHA_CORRECTION) * ema_correction
-                    )
+                # PID/EMA only advance on a new perception sample; between
+                # samples the last correction is held.
+                sample = perception.read(last_perception_seq)
+                new_sample = sample is not None
+                if new_sample:
+                    last_perception_seq = sample.seq
+                    perception_frame_ts = sample.frame_ts
+                    raw_error = float(sample.angle)
+
+                    # -------- EMA on ERROR (input smoothing) --------
+                    if not ema_error_initialized:
+                        ema_error = raw_error
+                        ema_error_initialized = True
+                    else:
+                        ema_error = (
+                            config.EMA_ALPHA_ERROR * raw_error +
+                            (1.0 - config.EMA_ALPHA_ERROR) * ema_error
+                        )
+
+                    filtered_error = ema_error
+
+                    # -------- PID --------
+                    # dt from capture times: tick jitter stays out of the D term
+                    raw_correction = steering_pid.compute(filtered_error, now=sample.frame_ts)
+
+                    # -------- EMA on CORRECTION (output smoothing) --------
+                    # None: first sample after start / a PID tuning change
+                    # (no dt yet) -> keep the previous correction
+                    if raw_correction is not None:
+                        if not ema_correction_initialized:
+                            ema_correction = raw_correction
+                            ema_correction_initialized = True
+                        else:
+                            ema_correction = (
+                                config.EMA_ALPHA_CORRECTION * raw_correction +
+                                (1.0 - config.EMA_ALPHA_CORRECTION) * ema_correction
+                            )
 
                 correction = ema_correction
 
-                # -------- Actuation --------
-                throttle = data.get("Pitch", 1500)
-                roll = int(1500 + correction)
+                # -------- Staleness --------
+                perception_age = None
+                if perception_frame_ts is not None:
+                    perception_age = time.monotonic() - perception_frame_ts
 
+                # -------- Actuation --------
+                throttle, perception_stop = stale_perception_throttle(
+                    data.get("Pitch", 1500), perception_age
+                )
+                roll = 1500 if perception_stop else int(1500 + correction)
 
-                # build a output telemetry JSON
-                json_string = f'{{"error":{filtered_error},"correction":{ema_correction},"throttle":{throttle} ,"V": {v} ,"I": {i},"P":{p} }}'
 
-                TelemetryOutput.send(json_string, 0.2)
+                # build a output telemetry frame
+                if config.TELEMETRY_FORMAT == "tlv":
+                    TelemetryOutput.send(TelemetryOutput.AUTO_LAYOUT.pack(
+                        (filtered_error, ema_correction, throttle, v, i, p)), 0.2, "auto")
+                else:
+                    json_string = f'{{"error":{filtered_error},"correction":{ema_correction},"throttle":{throttle} ,"V": {v} ,"I": {i},"P":{p} }}'
+                    TelemetryOutput.send(json_string, 0.2, "auto")
 
             # ------------------ SAFETY ------------------
-            if (now - last_valid_packet_local_time) > 1.0:
-                motor_serial.stop()
+            if (now - last_valid_packet_local_time) > config.FAILSAFE_TIMEOUT:
+                motor_cmd.stop()
             else:
                 direction, pwm1, pwm2 = RCMixer.compute_motor_commands(
                     roll, throttle, config.MOTOR_OFFSET_CORRECT
                 )
-                motor_serial.send_motor_command(direction, pwm1, pwm2)
+                mixer_ns = now_ns()
+                sent = motor_cmd.send(direction, pwm1, pwm2)
+                if new_sample:
+                    perception_latency.record_ns(int((time.monotonic() - perception_frame_ts) * 1e9))
+                if fresh_frame and sent:
+                    # serial stage completes when the sender's write() returns
+                    stage_latency.command_sent(client.recv_ns, client.decode_ns, mixer_ns)
 
     except KeyboardInterrupt:
         print("🛑 Shutting down...")
@@ -185,6 +293,7 @@ async def main(shared_angle, shared_seq, loop):
             await ws_task
         except asyncio.CancelledError:
             pass
+        client.close()
 
         motor_serial.stop()
         motor_serial.close_serial()
@@ -192,16 +301,16 @@ async def main(shared_angle, shared_seq, loop):
         await health.close()
 
 
-def run_main(shared_angle, shared_seq):
+def run_main(perception):
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     loop.set_debug(True)
 
     try:
-        loop.run_until_complete(main(shared_angle, shared_seq, loop))
+        loop.run_until_complete(main(perception, loop))
     finally:
         loop.close()
 
 
 if __name__ == "__main__":
-    run_main(None, None)  # replace with your shared memory objects
+    run_main(None)  # replace with your shared memory objects
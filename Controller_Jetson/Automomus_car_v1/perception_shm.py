@@ -0,0 +1,129 @@
+# perception_shm.py  (Python 3.6 SAFE)
+# Latest perception result shared between the vision process (writer) and
+# the control process (reader), protected by a sequence lock.
+
+import ctypes
+import zlib
+from collections import namedtuple
+from multiprocessing.sharedctypes import RawValue
+
+MAX_CENTER_POINTS = 32
+
+PerceptionSample = namedtuple(
+    "PerceptionSample",
+    "seq frame_ts angle confidence center_points"
+)
+
+
+class _Record(ctypes.Structure):
+    _fields_ = [
+        ("seq", ctypes.c_uint64),          # odd while the writer is inside write()
+        ("frame_ts", ctypes.c_double),     # time.monotonic() at camera capture
+        ("angle", ctypes.c_double),        # smoothed steering angle, degrees
+        ("confidence", ctypes.c_double),   # 0..1, share of scanned rows with path pixels
+        ("n_points", ctypes.c_uint32),
+        ("points", ctypes.c_int32 * (2 * MAX_CENTER_POINTS)),   # x0, y0, x1, y1, ...
+        ("crc", ctypes.c_uint32),          # CRC32 of every byte before this field
+    ]
+
+
+_CRC_OFFSET = _Record.crc.offset
+_SIZE = ctypes.sizeof(_Record)
+
+
+def _crc(rec):
+    return zlib.crc32(ctypes.string_at(ctypes.addressof(rec), _CRC_OFFSET))
+
+
+class PerceptionShm:
+    """
+    One perception record in shared memory (RawValue - multiprocessing's
+    shared_memory module needs Python 3.8, the Jetson runs 3.6). Pass the
+    object to both Process()es like the old Value()s.
+
+    Single writer (path_planning_thread), any number of readers. Seqlock:
+    the writer makes seq odd, then copies a complete record (even seq,
+    fields, CRC32 over seq + fields) in one memmove. A reader skips an
+    odd seq, copies the whole record in one memmove and keeps it only if
+    the CRC matches - otherwise it retries. No lock is ever held, so a
+    stalled reader can not block vision and vice versa.
+
+    Memory ordering: plain ctypes stores have no barriers, and on aarch64
+    (Jetson) another core may see them in any order - seq before the
+    fields, or half of a memmove. Correctness therefore does not rest on
+    store order: a snapshot is accepted only if its CRC matches its own
+    seq + fields, so any mix of two writes (or of a write in progress)
+    is rejected and re-read (CRC32 miss chance 2^-32 per torn copy). The
+    odd seq only saves readers a copy while a write is under way.
+    check_perception_shm.py is the cross-process stress check for it.
+    """
+
+    def __init__(self):
+        self._raw = RawValue(_Record)
+        self._local = None   # writer's staging record, made in the writer process
+
+    # =========================
+    # Writer (vision process)
+    # =========================
+
+    def write(self, angle, frame_ts, center_points, confidence):
+        rec = self._raw
+        seq = (rec.seq | 1) + 1   # next even number
+        rec.seq = seq - 1   # odd: write in progress
+
+        local = self._local
+        if local is None:
+            local = self._local = _Record()
+        local.seq = seq
+        local.frame_ts = frame_ts
+        local.angle = angle
+        local.confidence = confidence
+        n = min(len(center_points), MAX_CENTER_POINTS)
+        points = local.points
+        for k in range(n):
+            x, y = center_points[k]
+            points[2 * k] = int(x)
+            points[2 * k + 1] = int(y)
+        local.n_points = n
+        local.crc = _crc(local)
+
+        # even seq arrives with the record
+        ctypes.memmove(ctypes.addressof(rec), ctypes.addressof(local), _SIZE)
+
+    # =========================
+    # Reader (control process)
+    # =========================
+
+    def read(self, last_seq=None, retries=100):
+        """
+        Latest consistent PerceptionSample. Returns None if nothing was
+        written yet, if seq is still last_seq (no new result), or if the
+        writer kept the record busy for `retries` attempts.
+        """
+        rec = self._raw
+        snap = _Record()
+
+        for _ in range(retries):
+            seq = rec.seq
+            if seq & 1:
+                continue
+            if seq == 0 or seq == last_seq:
+                return None
+            ctypes.memmove(ctypes.addressof(snap), ctypes.addressof(rec), _SIZE)
+            if snap.seq & 1 or snap.crc != _crc(snap):
+                continue   # torn: the writer got in between
+
+            flat = snap.points[:2 * snap.n_points]
+            return PerceptionSample(
+                snap.seq,
+                snap.frame_ts,
+                snap.angle,
+                snap.confidence,
+                list(zip(flat[0::2], flat[1::2])),
+            )
+        return None
+
+    @property
+    def seq(self):
+        """Even sequence number of the last completed write (0 = none)."""
+        return self._raw.seq & ~1
@@ -0,0 +1,65 @@
+# postprocess.py
+# U-Net logits -> path mask, and the mapping between a model-resolution
+# mask and camera pixels. No TensorRT/CUDA imports (bench_postprocess.py).
+
+import cv2
+import numpy as np
+
+
+def threshold_logits(logits):
+    """
+    (1, 1, h, w) logits -> h x w uint8 mask (255 = path).
+
+    sigmoid(x) > 0.5 is x > 0, so no exp over the map: one compare into a
+    bool array, reused in place as the uint8 result. A fresh array per
+    call - the mask is handed to the planner thread while the next frame
+    is processed.
+    """
+    mask = np.greater(logits[0, 0], 0).view(np.uint8)
+    mask *= 255
+    return mask
+
+
+class MaskScale:
+    """
+    Model-resolution mask (mask_w x mask_h) seen as an out_w x out_h camera
+    image, exactly as cv2.resize(..., INTER_NEAREST) would upscale it:
+    camera column x reads mask column src_x[x], row y reads src_y[y]. The
+    maps come from cv2 itself, so scans through them match a scan of the
+    upscaled mask pixel for pixel.
+    """
+
+    def __init__(self, mask_w, mask_h, out_w, out_h):
+        self.mask_w, self.mask_h = mask_w, mask_h
+        self.out_w, self.out_h = out_w, out_h
+        self.identity = (mask_w, mask_h) == (out_w, out_h)
+
+        cols = np.arange(mask_w, dtype=np.float32)[None, :]
+        rows = np.arange(mask_h, dtype=np.float32)[:, None]
+        self.src_x = cv2.resize(cols, (out_w, 1), interpolation=cv2.INTER_NEAREST)[0].astype(np.intp)
+        self.src_y = cv2.resize(rows, (1, out_h), interpolation=cv2.INTER_NEAREST)[:, 0].astype(np.intp)
+
+    def x_span(self, first, last):
+        """Camera columns (first, last) covered by mask columns first..last (scalars or arrays)."""
+        if self.identity:
+            return first, last
+        return (np.searchsorted(self.src_x, first, "left"),
+                np.searchsorted(self.src_x, last, "right") - 1)
+
+    def upscale(self, mask):
+        """The full camera-resolution mask (only the overlay needs it)."""
+        if self.identity:
+            return mask
+        return cv2.resize(mask, (self.out_w, self.out_h), interpolation=cv2.INTER_NEAREST)
+
+
+_scales = {}
+
+
+def mask_scale(mask, out_w, out_h):
+    """Cached MaskScale for a mask of this shape shown at out_w x out_h."""
+    key = (mask.shape[1], mask.shape[0], out_w, out_h)
+    scale = _scales.get(key)
+    if scale is None:
+        scale = _scales[key] = MaskScale(*key)
+    return scale
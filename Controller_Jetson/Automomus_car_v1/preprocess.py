@@ -0,0 +1,68 @@
+# preprocess.py
+# Camera frame -> U-Net input tensor, without TensorRT/CUDA imports so it
+# can be checked and benchmarked on any machine (bench_preprocess.py).
+
+import cv2
+import numpy as np
+
+# ImageNet statistics used by the road model (albumentations Normalize)
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+
+class FusedPreprocessor:
+    """
+    BGR uint8 frame -> normalized RGB CHW float32, written straight into
+    `out` (the engine's page-locked input_h_mem):
+
+        out[c] = resized[:, :, 2 - c] * scale[c] + bias[c]
+
+    (x / 255 - mean) / std is folded into one multiply-add per channel
+    (scale = 1 / (255 * std), bias = -mean / std), and BGR -> RGB is just
+    which source channel feeds which plane. The resize goes into a
+    preallocated buffer, so a frame costs no full-size temporaries.
+
+    mean/std None = plain [0, 1] scaling (Marbel model).
+    """
+
+    def __init__(self, input_h, input_w, out, mean=None, std=None):
+        self.input_h = input_h
+        self.input_w = input_w
+
+        if mean is None:
+            mean = (0.0, 0.0, 0.0)
+        if std is None:
+            std = (1.0, 1.0, 1.0)
+        std = np.asarray(std, dtype=np.float64)
+        self.scale = [np.float32(s) for s in 1.0 / (255.0 * std)]
+        self.bias = [np.float32(b) for b in -np.asarray(mean, dtype=np.float64) / std]
+
+        self._resized = np.empty((input_h, input_w, 3), dtype=np.uint8)
+        self.out = out
+        # first image of the binding (it is max_batch_size images long)
+        view = out[:3 * input_h * input_w].reshape(3, input_h, input_w)
+        if out.dtype == np.float32:
+            self._chw = view
+            self._cast = None
+        else:
+            # FP16 engine input: compute in float32, convert on the copy
+            self._chw = np.empty((3, input_h, input_w), dtype=np.float32)
+            self._cast = view
+
+    def __call__(self, frame):
+        resized = self._resized
+        if frame.shape[0] == self.input_h and frame.shape[1] == self.input_w:
+            np.copyto(resized, frame)
+        else:
+            cv2.resize(frame, (self.input_w, self.input_h), dst=resized)
+
+        chw = self._chw
+        for c in range(3):
+            plane = chw[c]
+            np.multiply(resized[:, :, 2 - c], self.scale[c], out=plane)
+            if self.bias[c]:
+                np.add(plane, self.bias[c], out=plane)
+
+        if self._cast is not None:
+            np.copyto(self._cast, chw)
+        return self.out
@@ -92,7 +92,7 @@ def open_camera(cam_index: int, width: int, height: int, timeout: float = 2.0):
 
 
 
-def process_camera_stream(shared_angle, shared_seq):
+def process_camera_stream(perception):
     # -------- IMPORT GPU + GST HERE (child-only) --------
     import gi
     gi.require_version('Gst', '1.0')
@@ -114,7 +114,8 @@ def process_camera_stream(shared_angle, shared_seq):
         MODEL_INPUT_H,
         MODEL_INPUT_W,
         WIDTH,
-        HEIGHT
+        HEIGHT,
+        pipeline_depth=config.INFERENCE_PIPELINE_DEPTH
     )
 
     CAM = find_camera()
@@ -125,7 +126,7 @@ def process_camera_stream(shared_angle, shared_seq):
 
     planner_thread = threading.Thread(
         target=path_planning_thread,
-        args=(frame_queue, shared_angle, shared_seq, stop_event, state_lock, shared_state),
+        args=(frame_queue, perception, stop_event, state_lock, shared_state),
         name="PathPlanner",
         daemon=True
     )
@@ -133,31 +134,39 @@ def process_camera_stream(shared_angle, shared_seq):
 
     while True:
         ret, frame = cap.read()
-        if not ret:
-            break
+        frame_ts = time.monotonic()   # capture time -> perception age in control
 
         # ---------- 1. Inference (ALWAYS runs) ----------
-        mask = segmentor.infer(frame)
-        if frame_queue.empty():
-            frame_queue.put((frame.copy(), mask))
-       
-        
-        # ---------- 4. Choose frame to stream ----------
-        if USE_OVERLAY:
-           
-            frame_to_push = overlay(frame, mask, state_lock, shared_state)
-
+        # Pipelined: the mask (and frame) that comes back is from
+        # INFERENCE_PIPELINE_DEPTH - 1 frames ago, None while filling.
+        if ret:
+            result = segmentor.submit(frame, (frame, frame_ts))
+            results = [result] if result is not None else []
         else:
-            # ---- raw camera feed ----
-            frame_to_push = frame
-
-        # ---------- 5. Push to GStreamer ----------
-        frame_to_push = np.ascontiguousarray(frame_to_push)
-        buf = Gst.Buffer.new_wrapped(frame_to_push.tobytes())
-        buf.pts = pts
-        buf.duration = FRAME_DURATION
-        pts += FRAME_DURATION
-        appsrc.emit("push-buffer", buf)
+            # end of stream: frames still in the pipeline go out first
+            results = segmentor.flush()
+
+        for (frame, frame_ts), mask in results:
+            if frame_queue.empty():
+                frame_queue.put((frame.copy(), mask, frame_ts))
+
+            # ---------- 4. Choose frame to stream ----------
+            if USE_OVERLAY:
+                frame_to_push = overlay(frame, mask, state_lock, shared_state)
+            else:
+                # ---- raw camera feed ----
+                frame_to_push = frame
+
+            # ---------- 5. Push to GStreamer ----------
+            frame_to_push = np.ascontiguousarray(frame_to_push)
+            buf = Gst.Buffer.new_wrapped(frame_to_push.tobytes())
+            buf.pts = pts
+            buf.duration = FRAME_DURATION
+            pts += FRAME_DURATION
+            appsrc.emit("push-buffer", buf)
+
+        if not ret:
+            break
 
     appsrc.emit("end-of-stream")
     pipeline.set_state(Gst.State.NULL)
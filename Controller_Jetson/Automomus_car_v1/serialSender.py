@@ -1,16 +1,203 @@
 #!/usr/bin/env python3
 import serial
+import threading
 import time
 import struct
 
+from latency_stats import LatencyHistogram, now_ns
+
+# STM32 telemetry frame: 0x55 | u16 bus voltage raw | i16 current raw | 0x0A
+TELEMETRY_HEADER = 0x55
+TELEMETRY_END = 0x0A
+TELEMETRY_FRAME = struct.Struct('>BHhB')
+TELEMETRY_READ_SIZE = 4096   # max bytes taken from the driver per call
+
+
+def motor_packet(direction, speed_L, speed_R):
+    """0xAA | direction | left | right, each value clamped to 0..255."""
+    direction = max(0, min(direction, 255))
+    speed_L = max(0, min(speed_L, 255))
+    speed_R = max(0, min(speed_R, 255))
+    return bytes([0xAA, direction, speed_L, speed_R])
+
+
+class TelemetryParser:
+    """
+    Incremental parser for the STM32 telemetry stream. feed() takes any
+    chunk of bytes and returns the (voltage, current_ma, power_w) samples
+    completed by it; a partial frame at the end is kept for the next chunk.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self.frames = 0
+        self.resyncs = 0   # header found but no end byte -> rescan
+
+    def feed(self, chunk):
+        buf = self._buf
+        buf += chunk
+        samples = []
+        pos = 0
+        size = TELEMETRY_FRAME.size
+
+        while True:
+            start = buf.find(b'\x55', pos)
+            if start < 0:
+                pos = len(buf)
+                break
+            if start + size > len(buf):
+                pos = start   # wait for the rest of this frame
+                break
+
+            _, bus_raw, cur_raw, end_byte = TELEMETRY_FRAME.unpack_from(buf, start)
+            if end_byte != TELEMETRY_END:
+                # 0x55 inside a payload or a torn frame: resync one byte on
+                self.resyncs += 1
+                pos = start + 1
+                continue
+
+            voltage = ((bus_raw >> 3) * 4) / 1000.0
+            current_ma = cur_raw * 0.4
+            power_w = (voltage * current_ma) / 1000.0
+            samples.append((voltage, current_ma, power_w))
+            pos = start + size
+
+        del buf[:pos]
+        self.frames += len(samples)
+        return samples
+
+
+class MotorCommandScheduler:
+    """
+    Sits between the control loop and a SerialSender / SerialTransport and
+    decides which motor commands actually go on the wire:
+
+      - a changed command is sent at once,
+      - an unchanged one only every keepalive_interval (the STM32 stops the
+        motors after MOTOR_TIMEOUT = 1000 ms without a command),
+      - never more than max_rate packets/s; a change that hits the limit is
+        held and sent by the next send()/poll() once the interval is up.
+
+    stop() bypasses the rate limit. The control loop calls send() every
+    tick, which is what flushes held commands.
+
+    Only a packet the sender accepted (send_motor_command() returned True)
+    counts as sent: a failed write is retried by the next send()/poll()
+    instead of being deduplicated or repeated as a keepalive.
+    """
+
+    def __init__(self, sender, keepalive_interval=0.2, max_rate=100.0):
+        self.sender = sender
+        self.keepalive_interval = keepalive_interval
+        self.min_interval = 1.0 / max_rate if max_rate else 0.0
+
+        self.last_sent = None       # packet the sender last accepted
+        self.last_sent_time = float("-inf")
+        self._held = None           # changed command waiting for the rate limit
+
+        self.sent = 0               # packets the sender accepted (incl. keepalives)
+        self.keepalives = 0
+        self.suppressed = 0         # identical commands not sent
+        self.rate_limited = 0       # sends that found a change held by max_rate
+        self.failed = 0             # packets the sender did not accept
+
+    def send(self, direction, speed_L, speed_R, now=None):
+        """Returns True if a packet was handed to (and accepted by) the sender."""
+        self._held = motor_packet(direction, speed_L, speed_R)
+        return self.poll(now)
+
+    def stop(self, now=None):
+        """Sends stop now (no rate limit); repeated stops are deduplicated too."""
+        self._held = None
+        if now is None:
+            now = time.monotonic()
+        packet = motor_packet(0, 0, 0)
+        if packet == self.last_sent and now - self.last_sent_time < self.keepalive_interval:
+            self.suppressed += 1
+            return False
+        return self._emit(packet, now)
+
+    def poll(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        packet = self._held
+        elapsed = now - self.last_sent_time
+
+        if packet is None:
+            # nothing new: only feed the STM32 watchdog
+            if self.last_sent is not None and elapsed >= self.keepalive_interval:
+                return self._emit(self.last_sent, now, keepalive=True)
+            return False
+
+        if packet == self.last_sent:
+            self._held = None
+            if elapsed >= self.keepalive_interval:
+                return self._emit(packet, now, keepalive=True)
+            self.suppressed += 1
+            return False
+
+        if elapsed < self.min_interval:
+            self.rate_limited += 1
+            return False
+
+        if not self._emit(packet, now):
+            return False   # stays held: retried by the next send()/poll()
+        self._held = None
+        return True
+
+    def _emit(self, packet, now, keepalive=False):
+        if not self.sender.send_motor_command(packet[1], packet[2], packet[3]):
+            self.failed += 1
+            return False
+        self.last_sent = packet
+        self.last_sent_time = now
+        self.sent += 1
+        if keepalive:
+            self.keepalives += 1
+        return True
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "keepalives": self.keepalives,
+            "suppressed": self.suppressed,
+            "rate_limited": self.rate_limited,
+            "failed": self.failed,
+        }
+
+
 class SerialSender:
-    def __init__(self, port="/dev/ttyUSB0", baudrate=115200, packet_delay=0.002):
+    def __init__(self, port="/dev/ttyUSB0", baudrate=115200, packet_delay=0.002, async_writes=False,
+                 on_written=None):
         self.port = port
         self.baudrate = baudrate
         self.ser = None
         self.last_packet = None
         self.packet_delay = packet_delay  # small pause between packets
 
+        # async_writes: send_motor_command() only drops the packet in a
+        # single-slot mailbox and returns; a writer thread does the
+        # write/flush/packet_delay. A newer command overwrites one that has
+        # not been written yet (latest command wins).
+        self.async_writes = async_writes
+        self._mailbox = None            # (packet, queued_ns) or None
+        self._mailbox_cv = threading.Condition()
+        self._writer = None
+        self._writer_running = False
+
+        # write stats: queued -> flushed (async) or write+flush (sync)
+        self.write_latency = LatencyHistogram()
+        self.writes = 0
+        self.overwritten = 0    # commands replaced before reaching the UART
+        self.write_errors = 0
+        # on_written(queued_ns, written_ns) after each packet's write+flush
+        # returned (writer thread with async_writes), e.g. StageLatency.packet_written
+        self.on_written = on_written
+
+        # telemetry RX: partial frames carried over between read_telemetry() calls
+        self.telemetry = TelemetryParser()
+        self.telemetry_dropped = 0   # valid samples superseded by a newer one
+
     def open_serial(self):
         try:
             self.ser = serial.Serial(
@@ -34,12 +221,16 @@ class SerialSender:
             print(f"Sent init packet: {[hex(b) for b in init_packet]}")
 
             print(f"Serial port opened: {self.port} at {self.baudrate} baud")
+
+            if self.async_writes:
+                self._start_writer()
             return True
         except serial.SerialException as e:
             print(f"Serial error: {e}")
             return False
 
     def close_serial(self):
+        self._stop_writer()
         if self.ser and self.ser.is_open:
             self.ser.close()
             print("Serial port closed")
@@ -48,20 +239,33 @@ class SerialSender:
         if not self.ser or not self.ser.is_open:
             return False
 
-        direction = max(0, min(direction, 255))
-        speed_L = max(0, min(speed_L, 255))
-        speed_R = max(0, min(speed_R, 255))
-        packet = bytes([0xAA, direction, speed_L, speed_R])
+        packet = motor_packet(direction, speed_L, speed_R)
 
         # if packet == self.last_packet:
         #     return True  # avoid duplicate spam
 
+        if self._writer_running:
+            with self._mailbox_cv:
+                if self._mailbox is not None:
+                    self.overwritten += 1
+                self._mailbox = (packet, now_ns())
+                self._mailbox_cv.notify()
+            return True
+
+        return self._write_packet(packet, now_ns())
+
+    def _write_packet(self, packet, queued_ns):
         try:
             self.ser.write(packet)
             # time.sleep(100)
             self.ser.flush()
+            written_ns = now_ns()
+            self.write_latency.record_ns(written_ns - queued_ns)
+            self.writes += 1
+            if self.on_written is not None:
+                self.on_written(queued_ns, written_ns)
             self.last_packet = packet
-            # print(f"Sent: {direction}, {speed_L}, {speed_R}")
+            # print(f"Sent: {packet[1]}, {packet[2]}, {packet[3]}")
 
             # small delay to let device process
             if self.packet_delay:
@@ -69,42 +273,83 @@ class SerialSender:
 
             return True
         except serial.SerialException as e:
+            self.write_errors += 1
             print(f"Error sending packet: {e}")
             return False
-    
-    def read_telemetry(self):
-        if not self.ser:
-            return None
-
-        while self.ser.in_waiting >= 1:
-            byte = self.ser.read(1)
 
-            # Look for header
-            if byte != b'\x55':
-                continue
-
-            # Wait for full payload
-            if self.ser.in_waiting < 5:
-                return None
+    # =========================
+    # Writer thread (async_writes)
+    # =========================
 
-            payload = self.ser.read(5)
-            if len(payload) != 5:
-                return None
+    def _start_writer(self):
+        if self._writer is not None:
+            return
+        self._writer_running = True
+        self._writer = threading.Thread(target=self._writer_loop, name="serial-writer", daemon=True)
+        self._writer.start()
 
-            bus_raw, cur_raw, end_byte = struct.unpack('>HhB', payload)
+    def _stop_writer(self):
+        """Stops the writer once the pending command (e.g. stop()) is written."""
+        if self._writer is None:
+            return
+        with self._mailbox_cv:
+            self._writer_running = False
+            self._mailbox_cv.notify()
+        self._writer.join(timeout=1.0)
+        self._writer = None
 
-            if end_byte != 0x0A:
-                # Bad packet, resync
-                continue
+    def _writer_loop(self):
+        while True:
+            with self._mailbox_cv:
+                while self._mailbox is None and self._writer_running:
+                    self._mailbox_cv.wait()
+                item = self._mailbox
+                self._mailbox = None
+            if item is None:
+                return   # stopped and drained
+            self._write_packet(*item)
 
-            voltage = ((bus_raw >> 3) * 4) / 1000.0
-            current_ma = cur_raw * 0.4
-            power_w = (voltage * current_ma) / 1000.0
+    def write_stats(self):
+        """Write latency percentiles (ms) and counters - used by HealthMonitor."""
+        return {
+            **self.write_latency.summary(),
+            "writes": self.writes,
+            "overwritten": self.overwritten,
+            "errors": self.write_errors,
+        }
+    
+    def read_telemetry(self, all_samples=False):
+        """
+        Takes everything the driver has buffered in one read() (timeout=0,
+        so it never blocks) and scans it for 0x55 ... 0x0A frames.
+        Returns the newest (voltage, current_ma, power_w) sample, or None if
+        no complete frame arrived since the last call. With all_samples=True
+        returns the list of every sample instead (possibly empty).
+        A partial frame at the end is kept for the next call.
+        """
+        if not self.ser:
+            return [] if all_samples else None
 
-            return voltage, current_ma, power_w
+        try:
+            chunk = self.ser.read(TELEMETRY_READ_SIZE)
+        except serial.SerialException as e:
+            print(f"Telemetry read error: {e}")
+            chunk = b''
 
-        return None
+        samples = self.telemetry.feed(chunk)
+        if all_samples:
+            return samples
+        if not samples:
+            return None
+        self.telemetry_dropped += len(samples) - 1
+        return samples[-1]
 
+    def telemetry_stats(self):
+        return {
+            "frames": self.telemetry.frames,
+            "dropped": self.telemetry_dropped,
+            "resyncs": self.telemetry.resyncs,
+        }
 
     def stop(self):
         return self.send_motor_command(0, 0, 0)
@@ -0,0 +1,245 @@
+# serial_transport.py  (Python 3.6 SAFE)
+# Event-loop driven STM32 link: reads and writes on the tty fd through
+# loop.add_reader()/add_writer(), no pyserial calls inside the control loop.
+
+import asyncio
+import errno
+import os
+
+import serial
+
+from latency_stats import LatencyHistogram, now_ns
+from serialSender import TELEMETRY_READ_SIZE, TelemetryParser, motor_packet
+
+# write errors after which the fd will never work again
+_HANGUP_ERRNOS = (errno.EIO, errno.ENXIO, errno.ENODEV, errno.EBADF, errno.EPIPE)
+
+
+class SerialTransport:
+    """
+    Drop-in for SerialSender (open_serial / send_motor_command / stop /
+    read_telemetry / close_serial) on top of the event loop:
+
+      - telemetry is parsed as soon as the fd becomes readable and pushed
+        to on_telemetry(sample) and/or the bounded `samples` queue
+        (oldest dropped when full); read_telemetry() returns the newest
+        sample since the previous call, like SerialSender.
+      - send_motor_command() never blocks: the packet goes out with a
+        non-blocking os.write(), and if the tty buffer is full it waits
+        for add_writer(). A command that has not started going out yet is
+        replaced by a newer one (latest command wins); a packet that is
+        half written is always finished first so the STM32 stays in sync.
+
+    If the port goes away (EOF / EIO on the fd, e.g. USB adapter unplugged)
+    the fd is taken off the loop, `closed` is set and on_close(reason) is
+    called - the caller decides what to do; nothing is retried here.
+
+    pyserial is only used to open and configure the port (termios).
+    """
+
+    def __init__(self, port="/dev/ttyUSB0", baudrate=115200, loop=None,
+                 on_telemetry=None, queue_size=32, on_close=None, on_written=None):
+        self.port = port
+        self.baudrate = baudrate
+        self.loop = loop or asyncio.get_event_loop()
+        self.ser = None
+        self._fd = None
+        self.closed = False
+        self.close_reason = None
+        self.on_close = on_close
+
+        self.on_telemetry = on_telemetry
+        self.samples = asyncio.Queue(maxsize=queue_size) if queue_size else None
+        self.telemetry = TelemetryParser()
+        self.latest = None          # newest sample, for read_telemetry()
+        self._latest_fresh = False
+        self.telemetry_dropped = 0  # samples superseded before read_telemetry()
+        self.queue_overflow = 0     # samples pushed out of a full queue
+
+        self._out = bytearray()     # packet currently being written
+        self._out_ns = 0
+        self._next = None           # (packet, queued_ns) not started yet
+        self._writing = False       # add_writer() registered
+        self.last_packet = None
+        self.on_written = on_written   # (queued_ns, written_ns) once a packet is fully written
+
+        self.write_latency = LatencyHistogram()
+        self.writes = 0
+        self.overwritten = 0
+        self.write_errors = 0
+
+    # =========================
+    # Open / close
+    # =========================
+
+    def open_serial(self):
+        try:
+            self.ser = serial.Serial(
+                port=self.port,
+                baudrate=self.baudrate,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+                timeout=0
+            )
+            self.ser.reset_input_buffer()
+            self.ser.reset_output_buffer()
+        except serial.SerialException as e:
+            print(f"Serial error: {e}")
+            return False
+
+        self._fd = self.ser.fileno()
+        os.set_blocking(self._fd, False)
+        self.loop.add_reader(self._fd, self._on_readable)
+
+        # same init packet as SerialSender (without its blocking settle delay)
+        self._queue_packet(bytes([0xAA, 0x00, 0x00, 0x00]))
+        print(f"Serial port opened (asyncio): {self.port} at {self.baudrate} baud")
+        return True
+
+    def close_serial(self):
+        if self._fd is None:
+            if self.ser is not None and self.ser.is_open:
+                self.ser.close()   # after a hangup
+            return
+        # last command (normally stop()) goes out before the port closes
+        if self._out or self._next is not None:
+            os.set_blocking(self._fd, True)
+            self._flush()
+        self.loop.remove_reader(self._fd)
+        if self._writing:
+            self.loop.remove_writer(self._fd)
+            self._writing = False
+        self._fd = None
+        self.ser.close()
+        print("Serial port closed")
+
+    # =========================
+    # Motor commands
+    # =========================
+
+    def send_motor_command(self, direction, speed_L, speed_R):
+        if self._fd is None:
+            return False
+        self._queue_packet(motor_packet(direction, speed_L, speed_R))
+        return True
+
+    def stop(self):
+        return self.send_motor_command(0, 0, 0)
+
+    def _queue_packet(self, packet):
+        if self._next is not None:
+            self.overwritten += 1
+        self._next = (packet, now_ns())
+        if not self._writing:
+            self._flush()
+
+    def _flush(self):
+        while True:
+            if not self._out:
+                if self._next is None:
+                    break
+                packet, self._out_ns = self._next
+                self._next = None
+                self._out += packet
+                self.last_packet = packet
+            try:
+                n = os.write(self._fd, self._out)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                self.write_errors += 1
+                print(f"Error sending packet: {e}")
+                if e.errno in _HANGUP_ERRNOS:
+                    self._hangup(f"write: {e}")
+                    return
+                del self._out[:]
+                break
+            del self._out[:n]
+            if not self._out:
+                written_ns = now_ns()
+                self.write_latency.record_ns(written_ns - self._out_ns)
+                self.writes += 1
+                if self.on_written is not None:
+                    self.on_written(self._out_ns, written_ns)
+
+        pending = bool(self._out) or self._next is not None
+        if pending and not self._writing:
+            self.loop.add_writer(self._fd, self._flush)
+            self._writing = True
+        elif not pending and self._writing:
+            self.loop.remove_writer(self._fd)
+            self._writing = False
+
+    # =========================
+    # Telemetry
+    # =========================
+
+    def _hangup(self, reason):
+        """
+        The port is gone: a readable fd that keeps returning EOF / EIO
+        would call _on_readable() in a busy loop, so stop watching it.
+        """
+        fd = self._fd
+        self._fd = None
+        self.loop.remove_reader(fd)
+        if self._writing:
+            self.loop.remove_writer(fd)
+            self._writing = False
+        del self._out[:]
+        self._next = None
+
+        self.closed = True
+        self.close_reason = reason
+        print(f"Serial port lost: {reason}")
+        if self.on_close is not None:
+            self.on_close(reason)
+
+    def _on_readable(self):
+        try:
+            chunk = os.read(self._fd, TELEMETRY_READ_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            # not EAGAIN/EINTR: the next call would fail the same way
+            self._hangup(f"read: {e}")
+            return
+        if not chunk:
+            self._hangup("EOF")
+            return
+
+        for sample in self.telemetry.feed(chunk):
+            if self._latest_fresh:
+                self.telemetry_dropped += 1
+            self.latest = sample
+            self._latest_fresh = True
+            if self.on_telemetry is not None:
+                self.on_telemetry(sample)
+            if self.samples is not None:
+                if self.samples.full():
+                    self.samples.get_nowait()
+                    self.queue_overflow += 1
+                self.samples.put_nowait(sample)
+
+    def read_telemetry(self):
+        """Newest sample received since the previous call, or None."""
+        if not self._latest_fresh:
+            return None
+        self._latest_fresh = False
+        return self.latest
+
+    def telemetry_stats(self):
+        return {
+            "frames": self.telemetry.frames,
+            "dropped": self.telemetry_dropped,
+            "resyncs": self.telemetry.resyncs,
+            "queue_overflow": self.queue_overflow,
+        }
+
+    def write_stats(self):
+        return {
+            **self.write_latency.summary(),
+            "writes": self.writes,
+            "overwritten": self.overwritten,
+            "errors": self.write_errors,
+        }
@@ -0,0 +1,92 @@
+# tick_scheduler.py  (Python 3.6 SAFE)
+# Fixed-rate control loop ticks on absolute monotonic deadlines.
+
+import asyncio
+
+from latency_stats import LatencyHistogram
+
+# a wake-up this close to the deadline counts as the tick (timer granularity)
+_TOLERANCE = 0.0005
+
+
+class TickScheduler:
+    """
+    Deadlines are start + k * period on the loop's monotonic clock, so time
+    spent in the loop body is not added to the period (asyncio.sleep(0.02)
+    after the body ran at 20 ms + body time).
+
+    If the body overruns one or more deadlines, they are counted as misses
+    and skipped - the loop does not try to catch up with a burst of ticks.
+
+        ticker = TickScheduler(0.02, loop)
+        while True:
+            await ticker.wait()
+            ...   # body
+
+    wait(lambda timeout: client.wait_for_data(seq, timeout)) also returns
+    early when the awaitable does (new RC frame); the deadline grid is
+    unaffected.
+
+    Stats: lateness of each scheduled wake-up (jitter) and loop body
+    duration (wake-up -> next wait()), both as LatencyHistograms.
+    """
+
+    def __init__(self, period: float, loop=None):
+        self.period = period
+        self.loop = loop or asyncio.get_event_loop()
+        self._next = None
+        self._woke = None
+
+        self.ticks = 0
+        self.early_wakes = 0
+        self.misses = 0
+        self.jitter = LatencyHistogram()
+        self.body = LatencyHistogram()
+
+    def remaining(self) -> float:
+        """Seconds until the next deadline (0 if already due)."""
+        now = self.loop.time()
+        if self._next is None:
+            self._next = now + self.period
+        return max(0.0, self._next - now)
+
+    async def wait(self, wake=None) -> bool:
+        """
+        Sleeps until the next deadline, or until wake(timeout) returns.
+        Returns True for a scheduled tick, False for an early wake.
+        """
+        now = self.loop.time()
+        if self._woke is not None:
+            self.body.record_ns(int((now - self._woke) * 1e9))
+
+        timeout = self.remaining()
+        if wake is None:
+            await asyncio.sleep(timeout)
+        else:
+            await wake(timeout)
+
+        now = self.loop.time()
+        self._woke = now
+        if now < self._next - _TOLERANCE:
+            self.early_wakes += 1
+            return False
+
+        self.ticks += 1
+        self.jitter.record_ns(int(abs(now - self._next) * 1e9))
+        self._next += self.period
+        if self._next <= now:
+            missed = int((now - self._next) // self.period) + 1
+            self.misses += missed
+            self._next += missed * self.period
+        return True
+
+    def stats(self):
+        """Tick counters and LatencyHistogram.summary() of jitter and body time (ms)."""
+        return {
+            "period_ms": round(self.period * 1000.0, 3),
+            "ticks": self.ticks,
+            "early_wakes": self.early_wakes,
+            "misses": self.misses,
+            "jitter_ms": self.jitter.summary(),
+            "body_ms": self.body.summary(),
+        }
@@ -3,22 +3,65 @@
 import asyncio
 import websockets
 import struct
+import time
 from typing import List
 # Import the TinyTLVTx class AND the necessary constants
-from tinytlvx import TinyTLVTx, TTP_FRAME_TYPE_RC 
+from tinytlvx import TinyTLVTx, TinyTLVLayout, TTP_FRAME_TYPE_RC, TTP_FRAME_TYPE_RC_DELTA, CaptureWriter 
 
 # Removed: TTP_STX, TTP_MAX_FRAME, TTP_FRAME_TYPE_RC are now imported from tinytlvx
 
+# Fixed RC frame: 7 CT6B channels as u16 TLVs (IDs 0-6) + u32 timestamp (ID 100,
+# lower 32 bits of epoch ms, same as the browser). Matches RC_LAYOUT on the Jetson.
+RC_CHANNEL_COUNT = 7
+RC_TIMESTAMP_ID = 100
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
 class WebSocketSender:
     """
     Handles the WebSocket connection and sends channel data encoded 
     using the TinyTLVTx format.
+
+    Batching is opt-in: with batch_max_frames > 1, frames that arrive within
+    batch_max_delay seconds of the first one are concatenated into a single
+    binary WebSocket message (at most batch_max_frames per message). The
+    receiver's TinyTLVRx already parses several frames per message.
+
+    Delta mode is opt-in too: a full RC keyframe goes out every
+    keyframe_interval seconds, and in between only the channels that differ
+    from that keyframe are sent (TTP_FRAME_TYPE_RC_DELTA, plus timestamp).
+    Deltas are relative to the keyframe, not the previous frame, so a lost
+    delta is corrected by the next one.
     """
-    def __init__(self, ws_uri: str, receiver_queue: asyncio.Queue):
+    def __init__(self, ws_uri: str, receiver_queue: asyncio.Queue,
+                 batch_max_frames: int = 1, batch_max_delay: float = 0.0,
+                 delta_mode: bool = False, keyframe_interval: float = 0.5,
+                 capture_path: str = None):
         self.ws_uri = ws_uri
         self.receiver_queue = receiver_queue
+        self.batch_max_frames = max(1, batch_max_frames)
+        self.batch_max_delay = batch_max_delay
+        self.delta_mode = delta_mode
+        self.keyframe_interval = keyframe_interval
+        self._keyframe = None
+        self._keyframe_time = 0.0
         # Naming consistency: Use the official imported class name
         self.tlv_tx = TinyTLVTx()
+        self.rc_template = TinyTLVLayout(
+            TTP_FRAME_TYPE_RC,
+            [(ch_id, "H") for ch_id in range(RC_CHANNEL_COUNT)] + [(RC_TIMESTAMP_ID, "I")]
+        )
+
+        # Throughput counters, see get_stats()
+        self.messages_sent = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self._stats_time = time.monotonic()
+        self._stats_snapshot = (0, 0, 0)
+
+        # Optional record of every message sent (replay with python3 -m tinytlv)
+        self.capture = CaptureWriter(capture_path) if capture_path else None
         
     def pack_channels_to_tlv(self, channels: List[int]) -> bytes:
         """
@@ -37,6 +80,92 @@ class WebSocketSender:
             
         return self.tlv_tx.end()
 
+    def pack_rc_frame(self, channels: List[int]) -> bytes:
+        """
+        Fast path for the fixed 7-channel layout: one pack_into() into the
+        template's preallocated frame, plus the send timestamp.
+        """
+        timestamp = int(time.time() * 1000) & 0xFFFFFFFF
+        return self.rc_template.pack(list(channels) + [timestamp])
+
+    def pack_rc_delta(self, channels: List[int]) -> bytes:
+        """
+        Delta frame: u16 TLVs only for channels that differ from the last
+        keyframe, followed by the u32 timestamp.
+        """
+        self.tlv_tx.begin(TTP_FRAME_TYPE_RC_DELTA)
+        for ch_id, (ch_val, key_val) in enumerate(zip(channels, self._keyframe)):
+            if ch_val != key_val:
+                self.tlv_tx.addTLV(ch_id, 2, _U16.pack(ch_val))
+        timestamp = int(time.time() * 1000) & 0xFFFFFFFF
+        self.tlv_tx.addTLV(RC_TIMESTAMP_ID, 4, _U32.pack(timestamp))
+        return self.tlv_tx.end()
+
+    def encode_channels(self, channels: List[int], now: float = None) -> bytes:
+        if len(channels) != RC_CHANNEL_COUNT:
+            return self.pack_channels_to_tlv(channels)
+        if not self.delta_mode:
+            return self.pack_rc_frame(channels)
+
+        if now is None:
+            now = time.monotonic()
+        if self._keyframe is None or now - self._keyframe_time >= self.keyframe_interval:
+            self._keyframe = list(channels)
+            self._keyframe_time = now
+            return self.pack_rc_frame(channels)
+        return self.pack_rc_delta(channels)
+
+    async def next_message(self):
+        """
+        Waits for the next CT6B sample and returns (message, frame_count).
+        In batching mode, keeps collecting samples until batch_max_frames
+        is reached or batch_max_delay has passed since the first one.
+        """
+        channels = await self.receiver_queue.get()
+        frames = [self.encode_channels(channels)]
+        self.receiver_queue.task_done()
+
+        if self.batch_max_frames > 1:
+            loop = asyncio.get_event_loop()
+            deadline = loop.time() + self.batch_max_delay
+            while len(frames) < self.batch_max_frames:
+                if self.receiver_queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        channels = await asyncio.wait_for(self.receiver_queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    channels = self.receiver_queue.get_nowait()
+                frames.append(self.encode_channels(channels))
+                self.receiver_queue.task_done()
+
+        if len(frames) == 1:
+            return frames[0], 1
+        return b"".join(frames), len(frames)
+
+    def get_stats(self) -> dict:
+        """
+        Totals plus messages/frames/bytes per second since the previous call,
+        to measure the latency/throughput trade-off of the batching settings.
+        """
+        now = time.monotonic()
+        dt = max(now - self._stats_time, 1e-9)
+        prev_msgs, prev_frames, prev_bytes = self._stats_snapshot
+        stats = {
+            "messages": self.messages_sent,
+            "frames": self.frames_sent,
+            "bytes": self.bytes_sent,
+            "messages_per_s": (self.messages_sent - prev_msgs) / dt,
+            "frames_per_s": (self.frames_sent - prev_frames) / dt,
+            "bytes_per_s": (self.bytes_sent - prev_bytes) / dt,
+        }
+        self._stats_time = now
+        self._stats_snapshot = (self.messages_sent, self.frames_sent, self.bytes_sent)
+        return stats
+
     async def run_sender(self):
         """Connects to WebSocket and sends TTP frames from the queue."""
         while True:
@@ -45,16 +174,20 @@ class WebSocketSender:
                 async with websockets.connect(self.ws_uri) as websocket:
                     print(f"🌐 WebSocket connected to {self.ws_uri}")
                     print("Starting TinyTLV data transmission...")
+                    self._keyframe = None  # new connection starts with a keyframe
                     
                     while True: 
-                        channels = await self.receiver_queue.get()
-                        tlv_frame = self.pack_channels_to_tlv(channels)
-                        await websocket.send(tlv_frame)
-                        self.receiver_queue.task_done()
+                        message, frame_count = await self.next_message()
+                        await websocket.send(message)
+                        if self.capture:
+                            self.capture.write(message)
+                        self.messages_sent += 1
+                        self.frames_sent += frame_count
+                        self.bytes_sent += len(message)
                 
             except websockets.exceptions.ConnectionClosed as e:
                 print(f"\n[WARNING] WebSocket connection closed: {e.code}/{e.reason}. Reconnecting in 5 seconds...")
                 await asyncio.sleep(5)
             except Exception as e:
                 print(f"\n[ERROR] WebSocket error: {e}. Retrying in 5 seconds...")
-                await asyncio.sleep(5)
\ No newline at end of file
+                await asyncio.sleep(5)
@@ -0,0 +1,99 @@
+# bench_batching.py
+# WebSocketSender throughput through a local echo relay: one frame per
+# message (BATCH_MAX_FRAMES = 1, the old path) vs batched messages. The
+# relay echoes every message from the sender to a receiver connection,
+# which decodes it with TinyTLVRx as the Jetson does; a run ends when all
+# frames have been decoded there.
+#   python3 bench_batching.py [samples]
+
+import asyncio
+import random
+import sys
+import time
+
+import websockets
+
+from WebSocketSender import WebSocketSender, RC_CHANNEL_COUNT
+from tinytlvx import TinyTLVRx
+
+BATCHES = [1, 4, 8, 16]
+BATCH_MAX_DELAY = 0.010
+
+
+class EchoRelay:
+    """The first connection to say b"rx" receives an echo of everything the others send."""
+
+    def __init__(self):
+        self.sink = None
+        self.sink_ready = asyncio.Event()
+
+    async def handler(self, websocket, path=None):   # path: websockets < 10
+        try:
+            async for message in websocket:
+                if message == b"rx" and self.sink is None:
+                    self.sink = websocket
+                    self.sink_ready.set()
+                elif self.sink is not None:
+                    await self.sink.send(message)
+        except websockets.exceptions.ConnectionClosed:
+            pass   # sender task cancelled at the end of a run
+
+
+async def receive_frames(websocket, n_frames):
+    rx = TinyTLVRx()
+    frames = 0
+    while frames < n_frames:
+        for _ in rx.feed_buffer(await websocket.recv()):
+            rx.frame_ready = 0
+            frames += 1
+    return time.perf_counter()
+
+
+async def run(batch_max_frames, samples):
+    relay = EchoRelay()
+    server = await websockets.serve(relay.handler, "127.0.0.1", 0)
+    uri = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+    async with websockets.connect(uri) as receiver:
+        await receiver.send(b"rx")
+        await relay.sink_ready.wait()
+
+        queue = asyncio.Queue()
+        for channels in samples:   # CT6B backlog: the sender runs flat out
+            queue.put_nowait(channels)
+        sender = WebSocketSender(uri, queue, batch_max_frames=batch_max_frames,
+                                 batch_max_delay=BATCH_MAX_DELAY)
+        t0 = time.perf_counter()
+        sender_task = asyncio.create_task(sender.run_sender())
+        t1 = await receive_frames(receiver, len(samples))
+        sender_task.cancel()
+        await asyncio.gather(sender_task, return_exceptions=True)
+
+    server.close()
+    await server.wait_closed()
+
+    dt = t1 - t0
+    assert sender.frames_sent == len(samples), (sender.frames_sent, len(samples))
+    return sender.messages_sent, sender.bytes_sent, dt
+
+
+async def main(n_samples):
+    rnd = random.Random(5)
+    samples = [[rnd.randint(1000, 2000) for _ in range(RC_CHANNEL_COUNT)] for _ in range(n_samples)]
+
+    results = []
+    for batch in BATCHES:
+        results.append((batch,) + await run(batch, samples))
+
+    print(f"--- {n_samples} RC frames through a local echo relay ---")
+    print(f"{'frames/msg':>10} {'messages':>9} {'msg/s':>10} {'frames/s':>10} {'kB/s':>8}")
+    for batch, messages, nbytes, dt in results:
+        print(f"{batch:>10} {messages:>9} {messages / dt:>10,.0f} {n_samples / dt:>10,.0f} "
+              f"{nbytes / dt / 1000:>8.1f}")
+    base_fps = n_samples / results[0][3]
+    best_batch, _, _, best_dt = min(results[1:], key=lambda r: r[3])
+    print(f"batching x{best_batch}: {n_samples / best_dt / base_fps:.1f}x the frames/s of one frame per message")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
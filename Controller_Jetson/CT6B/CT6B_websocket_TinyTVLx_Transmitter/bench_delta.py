@@ -0,0 +1,57 @@
+# bench_delta.py
+# Bytes/s of full RC frames vs keyframe + delta frames on a stick trace.
+#   python3 bench_delta.py                 synthetic 50 Hz trace
+#   python3 bench_delta.py trace.csv       one sample per line: ch0,...,ch6
+
+import asyncio
+import math
+import random
+import sys
+
+from WebSocketSender import WebSocketSender, RC_CHANNEL_COUNT
+
+SAMPLE_RATE = 50.0   # CT6B trainer port packets per second
+CENTER = 1500
+
+
+def synthetic_trace(seconds=120, seed=4):
+    """Mostly idle sticks (driver waiting / cruising) with short manoeuvres."""
+    rnd = random.Random(seed)
+    samples = []
+    channels = [CENTER] * RC_CHANNEL_COUNT
+    t = 0
+    while t < seconds * SAMPLE_RATE:
+        idle = int(rnd.uniform(1.0, 6.0) * SAMPLE_RATE)
+        samples += [list(channels) for _ in range(idle)]
+        move = int(rnd.uniform(0.3, 2.0) * SAMPLE_RATE)
+        roll_amp, pitch_amp = rnd.randint(-400, 400), rnd.randint(-400, 400)
+        for i in range(move):
+            phase = math.sin(math.pi * i / move)
+            channels[0] = CENTER + int(roll_amp * phase)
+            channels[1] = CENTER + int(pitch_amp * phase)
+            samples.append(list(channels))
+        channels[0] = channels[1] = CENTER
+        t += idle + move
+    return samples
+
+
+def load_trace(path):
+    with open(path) as f:
+        return [[int(v) for v in line.split(",")[:RC_CHANNEL_COUNT]] for line in f if line.strip()]
+
+
+def measure(trace, delta_mode):
+    sender = WebSocketSender("ws://unused", asyncio.Queue(), delta_mode=delta_mode)
+    total = 0
+    for i, channels in enumerate(trace):
+        total += len(sender.encode_channels(channels, now=i / SAMPLE_RATE))
+    return total * SAMPLE_RATE / len(trace)
+
+
+if __name__ == "__main__":
+    trace = load_trace(sys.argv[1]) if len(sys.argv) > 1 else synthetic_trace()
+    full = measure(trace, delta_mode=False)
+    delta = measure(trace, delta_mode=True)
+    print(f"{len(trace)} samples @ {SAMPLE_RATE:.0f} Hz")
+    print(f"full RC frames   : {full:8.1f} B/s")
+    print(f"keyframe + delta : {delta:8.1f} B/s  ({100.0 * (1 - delta / full):.0f}% less)")
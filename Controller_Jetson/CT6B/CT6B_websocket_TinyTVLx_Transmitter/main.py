@@ -8,6 +8,27 @@ from WebSocketSender import WebSocketSender
 PORT = 'COM9'             
 BAUD = 115200             
 WS_URI = "wss://unmelodramatically-nonoxidating-mana.ngrok-free.dev/ws"
+
+# Batching: 1 = one TinyTLV frame per WebSocket message (default).
+# >1 coalesces up to N frames arriving within BATCH_MAX_DELAY seconds.
+BATCH_MAX_FRAMES = 1
+BATCH_MAX_DELAY = 0.010
+# Delta mode: send only changed channels between full keyframes.
+DELTA_MODE = False
+KEYFRAME_INTERVAL = 0.5   # seconds between full RC keyframes
+CAPTURE_PATH = None       # e.g. "ct6b_tx.ttlv" to record sent messages for replay
+STATS_INTERVAL = 0        # seconds between throughput prints, 0 = off
+
+
+async def report_stats(sender: WebSocketSender, interval: float):
+    """Prints messages/s and bytes/s so batching settings can be compared."""
+    while True:
+        await asyncio.sleep(interval)
+        s = sender.get_stats()
+        print(f"[STATS] {s['messages_per_s']:.1f} msg/s | {s['frames_per_s']:.1f} frames/s | "
+              f"{s['bytes_per_s']:.0f} B/s")
+
+
 async def main_async():
     """Initializes components and runs the reader/sender tasks."""
     
@@ -17,19 +38,32 @@ async def main_async():
         return # Exit if serial connection fails
 
     # 2. Initialize WebSocket Sender
-    sender = WebSocketSender(ws_uri=WS_URI, receiver_queue=receiver.queue)
+    sender = WebSocketSender(
+        ws_uri=WS_URI,
+        receiver_queue=receiver.queue,
+        batch_max_frames=BATCH_MAX_FRAMES,
+        batch_max_delay=BATCH_MAX_DELAY,
+        delta_mode=DELTA_MODE,
+        keyframe_interval=KEYFRAME_INTERVAL,
+        capture_path=CAPTURE_PATH
+    )
     
     # 3. Create and run concurrent tasks
     reader_task = asyncio.create_task(receiver.run_reader())
     sender_task = asyncio.create_task(sender.run_sender())
+    tasks = [reader_task, sender_task]
+    if STATS_INTERVAL > 0:
+        tasks.append(asyncio.create_task(report_stats(sender, STATS_INTERVAL)))
 
     try:
         # Wait for both tasks to complete
-        await asyncio.gather(reader_task, sender_task)
+        await asyncio.gather(*tasks)
     except KeyboardInterrupt:
         print("\n[INFO] Program stopped by user (Ctrl+C).")
     finally:
         receiver.close() # Ensure serial port is closed
+        if sender.capture:
+            sender.capture.close()
 
 def run_main():
     """Entry point for the application."""
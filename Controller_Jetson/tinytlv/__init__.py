@@ -0,0 +1,64 @@
+"""
+TinyTLV codec, shared by the Jetson receiver (Automomus_car_v1, CT6B
+receiver) and the CT6B transmitter.
+
+codec.py is the pure-Python reference implementation. If the optional C
+accelerator has been built (./build_accel.sh -> _tinytlv.so), TinyTLVRx
+is swapped for the ctypes-backed subclass from _accel.py (encoding stays
+pure Python). BACKEND tells which one is active; set TINYTLV_PURE=1 to
+force the reference.
+
+capture.py records raw WebSocket messages and replays them into the
+decoder at real-time, scaled or maximum speed; "python3 -m tinytlv capture.ttlv"
+replays a file from the command line (__main__.py). Its clock, now_ns(),
+is exported for the rest of the Jetson code.
+"""
+import os
+
+from . import codec
+from .codec import (
+    TTP_STX,
+    TTP_MAX_FRAME,
+    TTP_FRAME_TYPE_RC,
+    TTP_FRAME_TYPE_CONFIG,
+    TTP_FRAME_TYPE_RC_DELTA,
+    TTP_FRAME_TYPE_TELEMETRY,
+    xor_checksum,
+)
+
+from .capture import CaptureWriter, CaptureReader, replay, replay_async, now_ns
+
+TinyTLVTx = codec.TinyTLVTx
+TinyTLVRx = codec.TinyTLVRx
+TinyTLVLayout = codec.TinyTLVLayout
+BACKEND = "python"
+
+if not os.environ.get("TINYTLV_PURE"):
+    try:
+        from . import _accel
+    except (OSError, AttributeError):
+        pass  # _tinytlv.so not built, or stale
+    else:
+        TinyTLVTx = _accel.TinyTLVTx
+        TinyTLVRx = _accel.TinyTLVRx
+        TinyTLVLayout = _accel.TinyTLVLayout
+        BACKEND = "c"
+
+__all__ = [
+    "TTP_STX",
+    "TTP_MAX_FRAME",
+    "TTP_FRAME_TYPE_RC",
+    "TTP_FRAME_TYPE_CONFIG",
+    "TTP_FRAME_TYPE_RC_DELTA",
+    "TTP_FRAME_TYPE_TELEMETRY",
+    "xor_checksum",
+    "TinyTLVTx",
+    "TinyTLVRx",
+    "TinyTLVLayout",
+    "BACKEND",
+    "CaptureWriter",
+    "CaptureReader",
+    "replay",
+    "replay_async",
+    "now_ns",
+]
@@ -0,0 +1,38 @@
+# __main__.py
+# Replay a capture (capture.py format) into TinyTLVRx and report throughput.
+# Kept out of capture.py: the package imports capture, so running it with
+# "-m tinytlv.capture" would load it twice and runpy warns about that.
+#   python3 -m tinytlv rc.ttlv                # decode at max speed
+#   python3 -m tinytlv rc.ttlv --speed 1      # real time
+
+import argparse
+import time
+
+from . import BACKEND, TinyTLVRx, replay
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python3 -m tinytlv",
+                                     description="Replay a TinyTLV capture into TinyTLVRx")
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, 0 = max speed")
+    args = parser.parse_args()
+
+    rx = TinyTLVRx()
+    frames = 0
+
+    def decode(message):
+        nonlocal frames
+        for _ in rx.feed_buffer(message):
+            rx.frame_ready = 0
+            frames += 1
+
+    t0 = time.perf_counter()
+    messages = replay(args.path, decode, args.speed)
+    dt = time.perf_counter() - t0
+    print(f"[{BACKEND}] {messages} messages, {frames} frames in {dt:.3f}s "
+          f"({messages / dt:,.0f} msg/s, {frames / dt:,.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
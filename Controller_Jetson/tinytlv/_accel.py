@@ -0,0 +1,65 @@
+# _accel.py
+# ctypes bindings for _tinytlv.so. Importing this module raises OSError when
+# the library has not been built, AttributeError when it is stale (missing
+# symbols); __init__.py then keeps the pure codec.
+
+import ctypes
+import os
+
+from . import codec
+from .codec import TTP_MAX_FRAME
+
+_lib = ctypes.CDLL(os.path.join(os.path.dirname(os.path.abspath(__file__)), "_tinytlv.so"))
+
+_u8_p = ctypes.POINTER(ctypes.c_ubyte)
+
+_lib.ttp_rx_scan.argtypes = [
+    ctypes.POINTER(ctypes.c_int), _u8_p, ctypes.c_char_p, ctypes.c_size_t, ctypes.c_size_t
+]
+_lib.ttp_rx_scan.restype = ctypes.c_size_t
+
+_ttp_rx_scan = _lib.ttp_rx_scan
+
+
+def _state_field(i):
+    def get(self):
+        return self._st[i]
+
+    def set(self, value):
+        self._st[i] = value
+
+    return property(get, set)
+
+
+# Encoding stays pure Python: a ctypes call per frame just for the checksum
+# costs more on the Jetson than the xor it replaces. Only the RX byte scan,
+# one call per WebSocket message, is worth crossing into C.
+TinyTLVTx = codec.TinyTLVTx
+TinyTLVLayout = codec.TinyTLVLayout
+
+
+class TinyTLVRx(codec.TinyTLVRx):
+    # state/expected/pos live in a C int array so ttp_rx_scan() can update
+    # them in place; iterTLV()/nextTLV() etc. read them through properties.
+    state = _state_field(0)
+    expected = _state_field(1)
+    pos = _state_field(2)
+
+    def __init__(self):
+        self._st = (ctypes.c_int * 4)()
+        super().__init__()
+        self._cbuf = (ctypes.c_ubyte * TTP_MAX_FRAME).from_buffer(self.buf)
+
+    def feed_buffer(self, data):
+        """Same contract as codec.TinyTLVRx.feed_buffer(), scanned in C."""
+        if not isinstance(data, bytes):
+            data = bytes(data)
+
+        st = self._st
+        n = len(data)
+        off = 0
+        while off < n:
+            off = _ttp_rx_scan(st, self._cbuf, data, off, n)
+            if st[3]:
+                self.frame_ready = 1
+                yield self.buf[0]
@@ -0,0 +1,69 @@
+/*
+ * _tinytlv.c - optional C hot loops for the TinyTLV codec.
+ * Loaded through ctypes by _accel.py; build with ./build_accel.sh.
+ * Semantics must match codec.py exactly (see bench.py conformance check).
+ */
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+#define TTP_STX   0x02
+
+#define WAIT_STX  0
+#define READ_LEN  1
+#define READ_DATA 2
+
+uint8_t ttp_xor(const uint8_t *data, size_t off, size_t n)
+{
+    const uint8_t *p = data + off;
+    uint8_t chk = 0;
+
+    while (n--)
+        chk ^= *p++;
+    return chk;
+}
+
+/*
+ * Runs the TinyTLVRx state machine over data[off:n].
+ * st = {state, expected, pos, ready}; buf is the TTP_MAX_FRAME frame buffer.
+ * Stops right after a checksum-valid frame (st[3] = 1) or when data runs out.
+ * Returns the offset to resume from.
+ */
+size_t ttp_rx_scan(int *st, uint8_t *buf, const uint8_t *data, size_t off, size_t n)
+{
+    st[3] = 0;
+
+    while (off < n) {
+        if (st[0] == WAIT_STX) {
+            const uint8_t *p = memchr(data + off, TTP_STX, n - off);
+            if (p == NULL)
+                return n;
+            off = (size_t)(p - data) + 1;
+            st[0] = READ_LEN;
+
+        } else if (st[0] == READ_LEN) {
+            st[1] = data[off++];
+            st[2] = 0;
+            st[0] = READ_DATA;
+
+        } else {
+            size_t need = (size_t)(st[1] + 1 - st[2]);
+            size_t avail = n - off;
+            size_t k = need < avail ? need : avail;
+
+            memcpy(buf + st[2], data + off, k);
+            st[2] += (int)k;
+            off += k;
+
+            if (st[2] < st[1] + 1)
+                return off;    /* rest of the frame comes with the next message */
+
+            st[0] = WAIT_STX;
+            if (ttp_xor(buf, 0, (size_t)st[1]) == buf[st[1]]) {
+                st[3] = 1;
+                return off;
+            }
+        }
+    }
+    return off;
+}
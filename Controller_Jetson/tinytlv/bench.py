@@ -0,0 +1,288 @@
+# bench.py
+# Microbenchmarks and backend conformance check for the TinyTLV codec.
+# Run from Controller_Jetson/:  python3 -m tinytlv.bench
+
+import random
+import struct
+import time
+import tracemalloc
+
+from . import codec
+from .codec import TTP_FRAME_TYPE_RC, TTP_STX
+
+try:
+    from . import _accel
+except (OSError, AttributeError):
+    _accel = None  # ./build_accel.sh not run, or stale
+
+IMPLS = [("python", codec)] + ([("c", _accel)] if _accel is not None else [])
+
+N_FRAMES = 20000
+N_FUZZ = 2000
+
+
+def rc_layout(impl):
+    """Same layout the CT6B transmitter sends: 7 x u16 channels + u32 timestamp."""
+    return impl.TinyTLVLayout(TTP_FRAME_TYPE_RC, [(ch_id, "H") for ch_id in range(7)] + [(100, "I")])
+
+
+def make_rc_frame(tx, channels, ts):
+    tx.begin(TTP_FRAME_TYPE_RC)
+    for ch_id, ch_val in enumerate(channels):
+        tx.addTLV(ch_id, 2, struct.pack("<H", ch_val))
+    tx.addTLV(100, 4, struct.pack("<I", ts))
+    return tx.end()
+
+
+def make_stream(n, seed=1):
+    """n RC frames, with a little line noise between some of them."""
+    rnd = random.Random(seed)
+    tx = codec.TinyTLVTx()
+    out = []
+    for i in range(n):
+        channels = [rnd.randint(1000, 2000) for _ in range(7)]
+        out.append(make_rc_frame(tx, channels, i))
+        if i % 50 == 0:
+            out.append(bytes([0xFF, 0x00, 0x13]))
+    return out
+
+
+def bench(name, fn, n_frames):
+    t0 = time.perf_counter()
+    got = fn()
+    dt = time.perf_counter() - t0
+    print(f"{name:<34} {n_frames / dt:>12,.0f} frames/s  ({dt * 1e6 / n_frames:.2f} us/frame)")
+    return got
+
+
+# =========================
+# Conformance: every backend vs the per-byte reference
+# =========================
+
+def fuzz_corpus(seed=7):
+    """Valid frames of random layout mixed with corrupted frames and noise."""
+    rnd = random.Random(seed)
+    tx = codec.TinyTLVTx()
+    chunks = []
+    for _ in range(N_FUZZ):
+        tx.begin(rnd.randrange(256))
+        for _ in range(rnd.randrange(8)):
+            data = bytes(rnd.randrange(256) for _ in range(rnd.choice((1, 2, 4, 8))))
+            tx.addTLV(rnd.randrange(256), len(data), data)
+        frame = bytearray(tx.end())
+        roll = rnd.random()
+        if roll < 0.1:
+            frame[rnd.randrange(2, len(frame))] ^= 0x40   # bad checksum
+        elif roll < 0.2:
+            frame = frame[:rnd.randrange(1, len(frame))]   # truncated
+        chunks.append(bytes(frame))
+        if rnd.random() < 0.2:
+            chunks.append(bytes(rnd.choice((TTP_STX, rnd.randrange(256))) for _ in range(rnd.randrange(6))))
+    return b"".join(chunks)
+
+
+def reference_frames(stream):
+    rx = codec.TinyTLVRx()
+    frames = []
+    for b in stream:
+        if rx.feed(b):
+            frames.append(bytes(rx.buf[:rx.expected]))
+            rx.frame_ready = 0
+    return frames
+
+
+def conformance():
+    stream = fuzz_corpus()
+    expected = reference_frames(stream)
+    rnd = random.Random(3)
+
+    for name, impl in IMPLS:
+        # same stream, split into random WebSocket-sized messages
+        rx = impl.TinyTLVRx()
+        got = []
+        i = 0
+        while i < len(stream):
+            k = rnd.randrange(1, 64)
+            for _ in rx.feed_buffer(stream[i:i + k]):
+                got.append(bytes(rx.buf[:rx.expected]))
+            i += k
+        assert got == expected, f"{name}: feed_buffer() disagrees with reference"
+
+        # encoder: builder and template must agree with the reference bytes
+        tx = impl.TinyTLVTx()
+        layout = rc_layout(impl)
+        ref_tx = codec.TinyTLVTx()
+        for _ in range(N_FUZZ):
+            channels = [rnd.randrange(65536) for _ in range(7)]
+            ts = rnd.randrange(1 << 32)
+            want = make_rc_frame(ref_tx, channels, ts)
+            assert make_rc_frame(tx, channels, ts) == want, f"{name}: TinyTLVTx mismatch"
+            assert layout.pack(channels + [ts]) == want, f"{name}: TinyTLVLayout.pack mismatch"
+
+        print(f"conformance [{name}]: {len(expected)} frames, {N_FUZZ} encodes OK")
+
+
+# =========================
+# RX: feed() vs feed_buffer()
+# =========================
+
+def bench_rx_feed_buffer():
+    messages = make_stream(N_FRAMES)
+    print("--- TinyTLVRx: one WebSocket message per frame ---")
+
+    def per_byte():
+        rx = codec.TinyTLVRx()
+        count = 0
+        for message in messages:
+            for b in message:
+                if rx.feed(b):
+                    rx.frame_ready = 0
+                    count += 1
+        return count
+
+    assert bench("feed() per byte [python]", per_byte, N_FRAMES) == N_FRAMES
+
+    for name, impl in IMPLS:
+        def bulk():
+            rx = impl.TinyTLVRx()
+            count = 0
+            for message in messages:
+                for _ in rx.feed_buffer(message):
+                    rx.frame_ready = 0
+                    count += 1
+            return count
+
+        assert bench(f"feed_buffer() [{name}]", bulk, N_FRAMES) == N_FRAMES
+
+
+# =========================
+# RX: nextTLV() vs iterTLV() vs fixed layout
+# =========================
+
+def bench_rx_decode():
+    frame = make_stream(1)[0]
+    rx = codec.TinyTLVRx()
+    for _ in rx.feed_buffer(frame):
+        pass
+    layout = rc_layout(codec)
+    u16 = struct.Struct("<H")
+
+    def next_tlv():
+        out = 0
+        for _ in range(N_FRAMES):
+            rx.beginTLV()
+            while True:
+                tlv = rx.nextTLV()
+                if tlv is None:
+                    break
+                if tlv[1] == 2:
+                    out += struct.unpack("<H", tlv[2])[0]
+        return out
+
+    def iter_tlv():
+        out = 0
+        for _ in range(N_FRAMES):
+            for ch_id, data in rx.iterTLV():
+                if len(data) == 2:
+                    out += u16.unpack_from(data)[0]
+        return out
+
+    def unpack():
+        out = 0
+        for _ in range(N_FRAMES):
+            out += sum(layout.unpack(rx)[:-1])
+        return out
+
+    print("--- RC frame decode (7 x u16 + u32 timestamp) ---")
+    a = bench("nextTLV() + struct.unpack", next_tlv, N_FRAMES)
+    b = bench("iterTLV() + unpack_from", iter_tlv, N_FRAMES)
+    c = bench("TinyTLVLayout.unpack()", unpack, N_FRAMES)
+    assert a == b == c, (a, b, c)
+
+    # Blocks allocated in codec.py per decoded frame, with every result kept
+    # alive (list() of the iterator) so transient objects are counted too.
+    # The decoded values themselves (one tuple, one int per field) are the
+    # floor; only the layout path may stay at it.
+    n_fields = len(layout.ids)
+
+    def next_tlv_once():
+        rx.beginTLV()
+        return list(iter(rx.nextTLV, None))
+
+    def blocks_per_frame(fn):
+        fn()  # warm up
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        kept = [fn() for _ in range(100)]
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename")
+                     if stat.traceback[0].filename.endswith("codec.py"))
+        return blocks / len(kept)
+
+    results = {}
+    for name, fn in (("nextTLV()", next_tlv_once),
+                     ("iterTLV()", lambda: list(rx.iterTLV())),
+                     ("TinyTLVLayout.unpack()", lambda: layout.unpack(rx))):
+        results[name] = blocks_per_frame(fn)
+        print(f"{name:<34} {results[name]:>12.1f} blocks/frame")
+
+    # layout: values tuple + its ints, nothing per TLV on top
+    assert results["TinyTLVLayout.unpack()"] <= 1 + n_fields, results
+    # iterTLV: no bytes copy, but a view + a tuple per TLV (see its docstring)
+    assert results["iterTLV()"] <= 2 * n_fields + 0.5, results
+
+
+# =========================
+# TX: per-byte encoder vs TinyTLVTx vs frame template
+# =========================
+
+def legacy_encode(channels, ts):
+    """The original encoder: struct.pack per channel, byte-by-byte copies."""
+    buf = bytearray(256)
+    buf[2] = TTP_FRAME_TYPE_RC
+    pos = 3
+    for ch_id, data in [(i, struct.pack("<H", v)) for i, v in enumerate(channels)] + [(100, struct.pack("<I", ts))]:
+        buf[pos] = ch_id
+        buf[pos + 1] = len(data)
+        pos += 2
+        for b in data:
+            buf[pos] = b
+            pos += 1
+    length = pos - 2
+    out = bytearray(3 + length)
+    out[0] = TTP_STX
+    out[1] = length
+    chk = 0
+    for i in range(length):
+        out[2 + i] = buf[2 + i]
+        chk ^= buf[2 + i]
+    out[2 + length] = chk
+    return bytes(out)
+
+
+def bench_tx_encode():
+    rnd = random.Random(2)
+    samples = [[rnd.randint(1000, 2000) for _ in range(7)] for _ in range(N_FRAMES)]
+
+    print("--- RC frame encode (7 x u16 + u32 timestamp) ---")
+    want = bench("legacy per-byte encoder", lambda: [legacy_encode(ch, i) for i, ch in enumerate(samples)], N_FRAMES)
+
+    for name, impl in IMPLS:
+        tx = impl.TinyTLVTx()
+        layout = rc_layout(impl)
+        if impl is not codec and impl.TinyTLVTx is codec.TinyTLVTx:
+            continue   # _accel reuses the pure encoder
+        got = bench(f"TinyTLVTx begin/addTLV/end [{name}]",
+                    lambda: [make_rc_frame(tx, ch, i) for i, ch in enumerate(samples)], N_FRAMES)
+        assert got == want
+        got = bench(f"TinyTLVLayout.pack() [{name}]",
+                    lambda: [layout.pack(ch + [i]) for i, ch in enumerate(samples)], N_FRAMES)
+        assert got == want
+
+
+if __name__ == "__main__":
+    conformance()
+    bench_rx_feed_buffer()
+    bench_rx_decode()
+    bench_tx_encode()
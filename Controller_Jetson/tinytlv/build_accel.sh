@@ -0,0 +1,5 @@
+#!/bin/sh
+# Builds the optional C accelerator for the tinytlv package.
+# Without _tinytlv.so the package falls back to the pure-Python codec.
+cd "$(dirname "$0")"
+cc -O2 -shared -fPIC -o _tinytlv.so _tinytlv.c && echo "built $(pwd)/_tinytlv.so"
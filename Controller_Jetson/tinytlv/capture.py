@@ -0,0 +1,156 @@
+# capture.py
+# Record-and-replay for TinyTLV traffic.
+#
+# File format (append-only, little-endian):
+#   header : b"TTLVCAP1"
+#   record : u64 arrival time (monotonic ns) | u32 length | <length> message bytes
+#   session: u64 open time (monotonic ns) | u32 0xFFFFFFFF   (no payload)
+#
+# One record per WebSocket message, exactly as received/sent, so a capture
+# replays through TinyTLVRx.feed_buffer() the same way live traffic does.
+# Every CaptureWriter writes a session record first. Monotonic time is only
+# comparable within a session (the clock restarts at boot), so the reader
+# rebases each session to start where the previous one ended.
+#
+#   python3 -m tinytlv rc.ttlv                # decode at max speed
+#   python3 -m tinytlv rc.ttlv --speed 1      # real time
+
+import asyncio
+import mmap
+import os
+import struct
+import time
+
+MAGIC = b"TTLVCAP1"
+_RECORD = struct.Struct("<QI")
+_SESSION = 0xFFFFFFFF   # length field of a session record
+
+# time.monotonic_ns() is 3.7+, the Jetson runs 3.6
+now_ns = getattr(time, "monotonic_ns", lambda: int(time.monotonic() * 1e9))
+
+
+class CaptureWriter:
+    """Buffered append-only writer. Cheap enough to leave on in the receive path."""
+
+    def __init__(self, path: str, buffer_size: int = 64 * 1024):
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._f = open(path, "ab", buffering=buffer_size)
+        if new_file:
+            self._f.write(MAGIC)
+        self._f.write(_RECORD.pack(now_ns(), _SESSION))
+        self.records = 0
+
+    def write(self, message: bytes, ts_ns: int = None):
+        if ts_ns is None:
+            ts_ns = now_ns()
+        self._f.write(_RECORD.pack(ts_ns, len(message)))
+        self._f.write(message)
+        self.records += 1
+
+    def flush(self):
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+class CaptureReader:
+    """
+    Memory-maps a capture and iterates (ts_ns, message) records. Messages
+    come back as bytes, same type as websocket.recv() gives the live path.
+    A torn record at the end (writer killed mid-write) is ignored.
+
+    ts_ns is continuous over the whole file: the first message of each
+    appended session gets the timestamp of the last message before it, so
+    the time between two runs (or a clock reset by a reboot) is not
+    replayed. A timestamp going backwards inside a session - a capture
+    from before session records - starts a new session the same way.
+    """
+
+    def __init__(self, path: str):
+        self._f = open(path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        if size < len(MAGIC):
+            self._f.close()
+            raise ValueError(f"{path}: not a TinyTLV capture")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a TinyTLV capture")
+
+    def __iter__(self):
+        mm = self._mm
+        end = len(mm)
+        pos = len(MAGIC)
+        offset = 0        # added to the current session's timestamps
+        last = None       # rebased timestamp of the previous message
+        new_session = False
+        while pos + _RECORD.size <= end:
+            ts_ns, length = _RECORD.unpack_from(mm, pos)
+            pos += _RECORD.size
+            if length == _SESSION:
+                new_session = True
+                continue
+            if pos + length > end:
+                break
+            if last is not None and (new_session or ts_ns + offset < last):
+                offset = last - ts_ns
+            new_session = False
+            last = ts_ns + offset
+            yield last, mm[pos:pos + length]
+            pos += length
+
+    def close(self):
+        self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _schedule(records, speed):
+    """Yields (delay_s, message); delay is relative to the replay start."""
+    first = None
+    for ts_ns, message in records:
+        if first is None:
+            first = ts_ns
+        delay = (ts_ns - first) / 1e9 / speed if speed else 0.0
+        yield delay, message
+
+
+def replay(path: str, sink, speed: float = 0.0):
+    """
+    Feeds every recorded message to sink(message) - e.g. an
+    RCDataDecoder.handle_message or a TinyTLVRx.feed_buffer consumer.
+    speed: 1.0 = real time, 2.0 = twice as fast, 0 = as fast as possible.
+    Returns the number of messages replayed.
+    """
+    count = 0
+    with CaptureReader(path) as reader:
+        start = time.monotonic()
+        for delay, message in _schedule(reader, speed):
+            wait = start + delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            sink(message)
+            count += 1
+    return count
+
+
+async def replay_async(path: str, sink, speed: float = 1.0):
+    """replay() for the asyncio control loop: waits with asyncio.sleep()."""
+    loop = asyncio.get_event_loop()
+    count = 0
+    with CaptureReader(path) as reader:
+        start = loop.time()
+        for delay, message in _schedule(reader, speed):
+            wait = start + delay - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            sink(message)
+            count += 1
+    return count
+
@@ -0,0 +1,114 @@
+# check_capture.py
+# Capture round trip: write RC frames over several appended sessions, read
+# them back, replay them into TinyTLVRx (sync and asyncio), and check that
+# the time between sessions - or a clock that went backwards across a
+# reboot - is not replayed.
+# Run from Controller_Jetson/:  python3 -m tinytlv.check_capture
+
+import asyncio
+import os
+import tempfile
+import time
+
+from . import TTP_FRAME_TYPE_RC, TinyTLVLayout, TinyTLVRx
+from .capture import _RECORD, MAGIC, CaptureReader, CaptureWriter, replay, replay_async
+
+N_PER_SESSION = 20
+STEP_NS = 10000000          # 10 ms between messages inside a session
+SPEED = 10.0
+
+LAYOUT = TinyTLVLayout(TTP_FRAME_TYPE_RC, [(ch_id, "H") for ch_id in range(7)] + [(100, "I")])
+
+
+def rc_messages(n, base):
+    return [LAYOUT.pack([1000 + (base + k) % 1000] * 7 + [base + k]) for k in range(n)]
+
+
+def write_sessions(path, session_starts):
+    """One CaptureWriter per session start (ns), as separate runs would append."""
+    sent = []
+    for s, start in enumerate(session_starts):
+        writer = CaptureWriter(path)
+        for k, message in enumerate(rc_messages(N_PER_SESSION, s * N_PER_SESSION)):
+            writer.write(message, start + k * STEP_NS)
+            sent.append(message)
+        writer.close()
+    return sent
+
+
+def check_round_trip(path):
+    # session 2 starts 29 s after session 1; session 3 after a "reboot"
+    sent = write_sessions(path, [500 * 10**9, 529 * 10**9, 3 * 10**9])
+    with CaptureReader(path) as reader:
+        records = [(ts, bytes(message)) for ts, message in reader]
+    assert [m for _, m in records] == sent
+    gaps = [b[0] - a[0] for a, b in zip(records, records[1:])]
+    assert all(gap == STEP_NS for k, gap in enumerate(gaps) if (k + 1) % N_PER_SESSION), gaps
+    assert all(gap == 0 for k, gap in enumerate(gaps) if not (k + 1) % N_PER_SESSION), gaps
+    span = (records[-1][0] - records[0][0]) / 1e9
+    print(f"  {len(records)} messages in 3 sessions read back, replayed span {span:.2f} s")
+    return sent, span
+
+
+def check_old_capture(path):
+    """No session records and a clock reset: the backwards step is not replayed."""
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        for k, ts in enumerate((900, 910, 920, 5, 15)):
+            message = rc_messages(1, k)[0]
+            f.write(_RECORD.pack(ts * 10**6, len(message)) + message)
+    with CaptureReader(path) as reader:
+        times = [ts // 10**6 for ts, _ in reader]
+    assert times == [900, 910, 920, 920, 930], times
+
+
+def decode_count():
+    rx = TinyTLVRx()
+    frames = [0]
+
+    def sink(message):
+        for _ in rx.feed_buffer(message):
+            rx.frame_ready = 0
+            frames[0] += 1
+    return sink, frames
+
+
+def check_replay(path, sent, span):
+    sink, frames = decode_count()
+    t0 = time.perf_counter()
+    count = replay(path, sink, SPEED)
+    dt = time.perf_counter() - t0
+    assert count == frames[0] == len(sent), (count, frames[0])
+    # paced by the in-session gaps only: 29 s between sessions would add 2.9 s
+    assert span / SPEED <= dt < span / SPEED + 0.2, dt
+    print(f"  replay() x{SPEED:g}: {frames[0]} frames decoded in {dt:.3f} s (expected {span / SPEED:.3f} s)")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    sink, frames = decode_count()
+    t0 = time.perf_counter()
+    count = loop.run_until_complete(replay_async(path, sink, SPEED))
+    dt = time.perf_counter() - t0
+    loop.close()
+    assert count == frames[0] == len(sent), (count, frames[0])
+    assert span / SPEED <= dt < span / SPEED + 0.2, dt
+    print(f"  replay_async() x{SPEED:g}: {frames[0]} frames decoded in {dt:.3f} s")
+
+
+def check_torn_tail(path, sent):
+    with open(path, "ab") as f:
+        f.write(_RECORD.pack(0, 100) + b"\x02" * 10)   # writer killed mid-record
+    with CaptureReader(path) as reader:
+        assert [bytes(m) for _, m in reader] == sent
+    print("  torn last record ignored")
+
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "rc.ttlv")
+    sent, span = check_round_trip(path)
+    check_replay(path, sent, span)
+    check_torn_tail(path, sent)
+    check_old_capture(os.path.join(directory, "old.ttlv"))
+    print("  capture without session records: clock reset not replayed")
+    print("OK")
@@ -0,0 +1,265 @@
+# codec.py
+# Pure-Python reference implementation of the TinyTLV codec.
+# _accel.py overrides the hot paths in C when _tinytlv.so is built.
+
+import struct
+from typing import Union
+
+TTP_STX = 0x02
+TTP_MAX_FRAME = 256
+TTP_FRAME_TYPE_RC = 0x01 # New: Define the RC Frame Type here
+TTP_FRAME_TYPE_CONFIG =0x02 
+TTP_FRAME_TYPE_RC_DELTA = 0x03  # only channels changed since the last RC keyframe
+TTP_FRAME_TYPE_TELEMETRY = 0x04 # Jetson -> browser, float32 TLVs
+
+
+def xor_checksum(data) -> int:
+    """XOR of every byte in data, folded as one big integer (no per-byte loop)."""
+    n = len(data)
+    if n == 0:
+        return 0
+    acc = int.from_bytes(data, "little")
+    width = n
+    while width > 1:
+        half = (width + 1) // 2
+        acc = (acc & ((1 << (half * 8)) - 1)) ^ (acc >> (half * 8))
+        width = half
+    return acc
+
+# =====================================================
+# ====================== TX ===========================
+# =====================================================
+
+class TinyTLVTx:
+    def __init__(self):
+        self.buf = bytearray(TTP_MAX_FRAME)
+        self.view = memoryview(self.buf)
+        self.pos = 0
+        self.type = 0
+
+    def begin(self, t: int):
+        self.pos = 0
+        self.type = t
+
+        # Reserve STX + LEN later
+        self.buf[0] = 0
+        self.buf[1] = 0
+        self.buf[2] = self.type
+
+        self.pos = 3
+
+    def addTLV(self, id_: int, length: int, data: bytes):
+        self.buf[self.pos] = id_
+        self.buf[self.pos + 1] = length
+        self.pos += 2
+
+        n = len(data)
+        self.view[self.pos:self.pos + n] = data
+        self.pos += n
+
+    def end(self) -> bytes:
+        """Returns the final frame as bytes."""
+        length = self.pos - 2   # TYPE + TLVs
+
+        self.buf[0] = TTP_STX
+        self.buf[1] = length
+
+        # checksum over TYPE+TLVs
+        self.buf[self.pos] = xor_checksum(self.view[2:self.pos])
+
+        return bytes(self.view[:self.pos + 1])
+
+class TinyTLVRx:
+    WAIT_STX = 0
+    READ_LEN = 1
+    READ_DATA = 2
+
+    def __init__(self):
+        self.buf = bytearray(TTP_MAX_FRAME)
+        self.view = memoryview(self.buf)  # reused for zero-copy slices
+        self.reset()
+
+    def reset(self):
+        self.pos = 0
+        self.expected = 0
+        self.state = TinyTLVRx.WAIT_STX
+        self.frame_ready = 0
+        self.tlv_pos = 0
+
+    def feed(self, b: int) -> int:
+        """Feed ONE BYTE. Returns 1 when a full frame is ready."""
+        if self.state == TinyTLVRx.WAIT_STX:
+            if b == TTP_STX:
+                self.state = TinyTLVRx.READ_LEN
+
+        elif self.state == TinyTLVRx.READ_LEN:
+            self.expected = b
+            self.pos = 0
+            self.state = TinyTLVRx.READ_DATA
+
+        elif self.state == TinyTLVRx.READ_DATA:
+            self.buf[self.pos] = b
+            self.pos += 1
+
+            if self.pos >= self.expected + 1:  # +1 includes checksum
+                # check XOR-sum
+                calc = xor_checksum(self.view[:self.expected])
+
+                chk = self.buf[self.expected]
+
+                if chk == calc:
+                    self.frame_ready = 1
+
+                self.state = TinyTLVRx.WAIT_STX
+                return self.frame_ready
+
+        return 0
+
+    def feed_buffer(self, data: Union[bytes, bytearray, memoryview]):
+        """
+        Feed a whole message at once. Yields the frame TYPE of every
+        complete, checksum-valid frame; while suspended the frame sits in
+        self.buf, so beginTLV()/nextTLV() work exactly as after feed().
+
+        Same resync rules as feed(): hunt for STX, take the next byte as LEN,
+        then consume LEN+1 bytes whether or not the checksum matches.
+        Partial frames carry over to the next call.
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()  # bytes.find() needs a real bytes object
+
+        n = len(data)
+        i = 0
+        while i < n:
+            if self.state == TinyTLVRx.WAIT_STX:
+                i = data.find(TTP_STX, i)
+                if i < 0:
+                    return
+                i += 1
+                self.state = TinyTLVRx.READ_LEN
+
+            elif self.state == TinyTLVRx.READ_LEN:
+                self.expected = data[i]
+                i += 1
+                self.pos = 0
+                self.state = TinyTLVRx.READ_DATA
+
+            else:
+                end = min(n, i + self.expected + 1 - self.pos)
+                self.buf[self.pos:self.pos + end - i] = data[i:end]
+                self.pos += end - i
+                i = end
+
+                if self.pos < self.expected + 1:
+                    return  # rest of the frame comes with the next message
+
+                self.state = TinyTLVRx.WAIT_STX
+                calc = xor_checksum(self.view[:self.expected])
+                if self.buf[self.expected] == calc:
+                    self.frame_ready = 1
+                    yield self.buf[0]
+
+    def isComplete(self) -> int:
+        return self.frame_ready
+
+    def getType(self) -> int:
+        return self.buf[0]  # same as C++
+
+    def beginTLV(self):
+        self.tlv_pos = 1  # TYPE is at index 0
+
+    def nextTLV(self):
+        """Returns (id, length, data_bytes) OR None if done."""
+        if self.tlv_pos >= self.expected:
+            self.frame_ready = 0
+            return None
+
+        id_ = self.buf[self.tlv_pos]
+        self.tlv_pos += 1
+
+        length = self.buf[self.tlv_pos]
+        self.tlv_pos += 1
+
+        data = bytes(self.buf[self.tlv_pos:self.tlv_pos + length])
+
+        self.tlv_pos += length
+
+        return id_, length, data
+
+    def iterTLV(self):
+        """
+        Yields (id, memoryview) for every TLV in the current frame.
+        The views point into self.buf, so they are only valid until the
+        next feed()/feed_buffer() call - unpack them, don't keep them.
+
+        No bytes copy per TLV (unlike nextTLV()), but each TLV still costs
+        a view and a tuple. Zero per-TLV allocations only hold for
+        TinyTLVLayout.unpack(), which the control path uses for RC frames.
+        """
+        view = self.view
+        end = self.expected
+        pos = 1  # TYPE is at index 0
+        while pos + 2 <= end:
+            length = view[pos + 1]
+            yield view[pos], view[pos + 2:pos + 2 + length]
+            pos += 2 + length
+        self.frame_ready = 0
+
+
+class TinyTLVLayout:
+    """
+    Precompiled fixed frame layout: TYPE followed by TLVs with known IDs and
+    struct formats, in order. One struct.Struct covers the whole frame, so a
+    frame is decoded with a single unpack_from() and encoded with a single
+    pack_into() into a preallocated buffer - no per-TLV objects either way.
+
+        RC = TinyTLVLayout(TTP_FRAME_TYPE_RC, [(0, "H"), (1, "H"), (100, "I")])
+        frame = RC.pack((1500, 1500, ts))
+    """
+
+    def __init__(self, frame_type: int, fields):
+        self.frame_type = frame_type
+        self.ids = tuple(id_ for id_, _ in fields)
+        lengths = [struct.calcsize("<" + fmt) for _, fmt in fields]
+
+        # TYPE/ID/LEN bytes only (values skipped) - used to validate a frame
+        self._header = struct.Struct("<B" + "".join("BB%dx" % n for n in lengths))
+        self._expected_header = (frame_type,) + tuple(
+            b for id_, n in zip(self.ids, lengths) for b in (id_, n)
+        )
+        # values only (TYPE/ID/LEN skipped) - one tuple per frame
+        self.struct = struct.Struct("<x" + "".join("xx" + fmt for _, fmt in fields))
+        self.size = self.struct.size  # TYPE + TLVs, i.e. the LEN byte
+
+        # TX: whole wire frame STX LEN TYPE [ID LEN VALUE]... CHK. The header
+        # arguments are prefilled; pack() only drops the values into the
+        # slots at 5, 8, 11, ...
+        self._frame = struct.Struct("<BBB" + "".join("BB" + fmt for _, fmt in fields) + "B")
+        self._args = [TTP_STX, self.size, frame_type]
+        for id_, n in zip(self.ids, lengths):
+            self._args += [id_, n, 0]
+        self._args.append(0)
+        self._values = slice(5, 5 + 3 * len(fields), 3)
+        self.buf = bytearray(self._frame.size)
+        self._view = memoryview(self.buf)
+
+    def unpack(self, rx: TinyTLVRx):
+        """
+        Returns the field values of the frame in rx as a tuple, or None if
+        the frame does not have exactly this layout (caller falls back to
+        iterTLV()/nextTLV()).
+        """
+        if rx.expected != self.size:
+            return None
+        if self._header.unpack_from(rx.buf) != self._expected_header:
+            return None
+        rx.frame_ready = 0
+        return self.struct.unpack_from(rx.buf)
+
+    def pack(self, values) -> bytes:
+        """Encodes one frame; values are in the same order as the fields."""
+        args = self._args
+        args[self._values] = values
+        self._frame.pack_into(self.buf, 0, *args)
+        self.buf[-1] = xor_checksum(self._view[2:-1])
+        return bytes(self.buf)
@@ -6,6 +6,7 @@ import { CameraView } from "~/uitls/CameraView";
 import { useHealth } from "~/uitls/HealthCheck";
 import LatencyGraph from "~/Components/LatencyGraph";
 import makeConfig_Packets from "~/uitls/makeConfig_Packets";
+import { decodeTelemetry } from "~/uitls/TinyTVL";
 // Imported Components
 import { Card, StatusBadge, MetricRow, ProgressBar, ModeBadge } from "~/Components/DashboardUI";
 import { Joystick } from "~/Components/Joystick";
@@ -85,6 +86,16 @@ export default function ControllerDashboard() {
         });
         return;
       }
+    } else if (lastMessage instanceof ArrayBuffer) {
+      // Binary TinyTLV telemetry frame from the Jetson
+      const fields = decodeTelemetry(lastMessage);
+      if (!fields) return;
+      if (fields.error === undefined) {
+        const { V, I, P } = fields;
+        parsed = { motorTelemetry: { V, I, P } };
+      } else {
+        parsed = fields;
+      }
     } else if (typeof lastMessage === "object") {
       parsed = lastMessage;
     }
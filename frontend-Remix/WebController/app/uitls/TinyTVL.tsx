@@ -1,6 +1,17 @@
 const TTP_MAX_FRAME = 256
 const TTP_STX = 0x02
 // const TTP_FRAME_TYPE_RC = 0x01
+export const TTP_FRAME_TYPE_TELEMETRY = 0x04
+
+// Jetson telemetry TLV ids (Automomus_car_v1/TelemetryOutput.py TELEMETRY_IDS)
+const TELEMETRY_NAMES: Record<number, string> = {
+    1: "V",
+    2: "I",
+    3: "P",
+    4: "error",
+    5: "correction",
+    6: "throttle",
+};
 
 const buffer = new ArrayBuffer(TTP_MAX_FRAME);
 const view = new DataView(buffer);
@@ -89,3 +100,41 @@ export function decode(viewRX: DataView): DataView {
     tvl.setUint8(1, viewRX.getUint8(6))
     return tvl;
 }
+
+// Binary telemetry from the Jetson -> { V: 12.1, I: 300, ... }
+// One WebSocket message may carry several frames back to back (the Jetson
+// coalesces topics published together); their fields are merged.
+// Returns null if no valid telemetry frame is found.
+export function decodeTelemetry(data: ArrayBuffer): Record<string, number> | null {
+    const frame = new DataView(data);
+    const out: Record<string, number> = {};
+    let found = false;
+    let start = 0;
+
+    while (start + 4 <= frame.byteLength && frame.getUint8(start) === TTP_STX) {
+        const length = frame.getUint8(start + 1);
+        const end = start + 2 + length;   // index of the checksum byte
+        if (end >= frame.byteLength) break;
+
+        let crc = 0;
+        for (let i = start + 2; i < end; i++) {
+            crc ^= frame.getUint8(i);
+        }
+        if (crc !== frame.getUint8(end)) break;
+
+        if (frame.getUint8(start + 2) === TTP_FRAME_TYPE_TELEMETRY) {
+            let p = start + 3;
+            while (p + 2 <= end) {
+                const id = frame.getUint8(p);
+                const size = frame.getUint8(p + 1);
+                if (size === 4) {
+                    out[TELEMETRY_NAMES[id] ?? `id_${id}`] = frame.getFloat32(p + 2, true);
+                }
+                p += 2 + size;
+            }
+            found = true;
+        }
+        start = end + 1;
+    }
+    return found ? out : null;
+}